@@ -0,0 +1,88 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : audit_events.py
+'''
+import sys
+
+# Column headings of the machine readable report artifacts
+exportColumns = ("Project", "Project ID", "Inventory Item", "Inventory Item ID", "Inventory Item Link", "Field", "Date", "User", "User Email", "Original Value", "New Value")
+
+#------------------------------------------------------------------#
+class AuditEvent(object):
+    '''
+    Single change to an audited field of an inventory item.  Users and values repeat across
+    many events so the strings are interned and each event holds references to a shared copy.
+    Events are stored within the report cache as a compact list of their values.
+    '''
+    __slots__ = ("field", "date", "user", "userEmail", "oldValue", "newValue")
+
+    def __init__(self, field, date, user, userEmail, oldValue, newValue):
+        self.field = intern_value(field)
+        self.date = date
+        self.user = intern_value(user)
+        self.userEmail = intern_value(userEmail)
+        self.oldValue = intern_value(oldValue)
+        self.newValue = intern_value(newValue)
+
+    #---------------------------------------#
+    def set_values(self, oldValue, newValue):
+        self.oldValue = intern_value(oldValue)
+        self.newValue = intern_value(newValue)
+
+    #---------------------------------------#
+    def to_state(self):
+        return [self.field, self.date, self.user, self.userEmail, self.oldValue, self.newValue]
+
+    #---------------------------------------#
+    @classmethod
+    def from_state(cls, eventState):
+        return cls(*eventState)
+
+#------------------------------------------------------------------#
+class AuditItem(object):
+    '''
+    Inventory item with at least one reportable event.  The link to the item within Code
+    Insight is only created when a report artifact asks for it.
+    '''
+    __slots__ = ("inventoryID", "inventoryItemName", "projectID", "projectName", "projectLink", "baseURL", "events")
+
+    def __init__(self, inventoryID, inventoryItemName, projectID, projectName, projectLink, baseURL, events):
+        self.inventoryID = inventoryID
+        self.inventoryItemName = inventoryItemName
+        self.projectID = projectID
+        self.projectName = projectName
+        self.projectLink = projectLink
+        self.baseURL = baseURL
+        self.events = events  # Dictionary of AuditEvent by event key
+
+    #---------------------------------------#
+    @property
+    def inventoryItemLink(self):
+        return self.baseURL + '''/codeinsight/FNCI#myprojectdetails/?id=''' + str(self.projectID) + '''&tab=projectInventory&pinv=''' + str(self.inventoryID)
+
+#------------------------------------------------------------------#
+def intern_value(value):
+    # Only strings can be interned.  License IDs awaiting resolution may be numbers
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+#------------------------------------------------------------------#
+def events_to_state(events):
+    return {eventKey : event.to_state() for eventKey, event in events.items()}
+
+#------------------------------------------------------------------#
+def events_from_state(eventStates):
+    return {eventKey : AuditEvent.from_state(eventState) for eventKey, eventState in eventStates.items()}
+
+#------------------------------------------------------------------#
+def get_export_rows(auditItem):
+    # One row per event in the order of exportColumns
+    inventoryItemLink = auditItem.inventoryItemLink
+    for event in auditItem.events.values():
+        yield (auditItem.projectName, auditItem.projectID, auditItem.inventoryItemName, auditItem.inventoryID, inventoryItemLink, event.field, event.date, event.user, event.userEmail, event.oldValue, event.newValue)
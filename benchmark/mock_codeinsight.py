@@ -0,0 +1,324 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : mock_codeinsight.py
+'''
+import logging, argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+logger = logging.getLogger(__name__)
+
+statisticsPath = "/benchmark/statistics"  # Request counts of the server as json
+
+###################################################################################
+# Create command line argument options
+parser = argparse.ArgumentParser(description="Local mock Code Insight server serving synthetic data")
+parser.add_argument("--depth", type=int, default=2, help="Levels of child projects below the root project")
+parser.add_argument("--width", type=int, default=3, help="Child projects of each project")
+parser.add_argument("--items", type=int, default=50, help="Inventory items per project")
+parser.add_argument("--events", type=int, default=5, help="History events per inventory item")
+parser.add_argument("--licenses", type=int, default=40, help="Distinct licenses used by the events")
+parser.add_argument("--unmodified", type=float, default=0.25, help="Share of inventory items never updated since they were created")
+parser.add_argument("--latency", type=float, default=0.005, help="Seconds added to every request")
+parser.add_argument("--port", type=int, default=0, help="Port to listen on (0 for any free port)")
+
+#------------------------------------------------------------------#
+class SyntheticPortfolio(object):
+    '''
+    Deterministic synthetic Code Insight data.  The project hierarchy is hierarchyDepth levels
+    below the root with hierarchyWidth children per project.  Each project has itemsPerProject
+    components and each component eventsPerItem history events.  A share of the components
+    (unmodifiedRatio) have never been updated since they were created and have no history.
+    '''
+
+    def __init__(self, hierarchyDepth=2, hierarchyWidth=3, itemsPerProject=50, eventsPerItem=5, licenseCount=40, unmodifiedRatio=0.25, seed=1):
+        self.hierarchyDepth = hierarchyDepth
+        self.hierarchyWidth = hierarchyWidth
+        self.itemsPerProject = itemsPerProject
+        self.eventsPerItem = eventsPerItem
+        self.licenseCount = licenseCount
+        self.unmodifiedRatio = unmodifiedRatio
+        self.seed = seed
+
+        self.projectNames = {}
+        self.hierarchy = self.create_project(1, 0)
+
+    #---------------------------------------#
+    def create_project(self, projectID, depth):
+        self.projectNames[projectID] = "Benchmark Project %s" %projectID
+
+        childProjects = []
+        if depth < self.hierarchyDepth:
+            for childIndex in range(self.hierarchyWidth):
+                childProjects.append(self.create_project(len(self.projectNames) + 1, depth + 1))
+
+        return {"id" : projectID, "name" : self.projectNames[projectID], "childProject" : childProjects}
+
+    #---------------------------------------#
+    def get_random(self, *keys):
+        return random.Random("%s|%s" %(self.seed, "|".join(str(key) for key in keys)))
+
+    #---------------------------------------#
+    def get_child_projects(self, projectID):
+        return find_project(self.hierarchy, projectID)
+
+    #---------------------------------------#
+    def get_project_information(self, projectID):
+        customFields = [
+            {"fieldLabel" : "Application Name", "value" : "Benchmark Application %s" %projectID},
+            {"fieldLabel" : "Application Version", "value" : "1.%s" %projectID},
+            {"fieldLabel" : "Application Publisher", "value" : "Benchmark"},
+        ]
+        return {"id" : projectID, "name" : self.projectNames.get(projectID, "Project %s" %projectID), "customFields" : customFields}
+
+    #---------------------------------------#
+    def get_inventory_summary(self, projectID):
+        inventoryItems = []
+        for itemIndex in range(self.itemsPerProject):
+            randomValues = self.get_random("item", projectID, itemIndex)
+            createdOn = "2023-01-%02d 10:00:00" %(1 + itemIndex % 28)
+            unmodified = randomValues.random() < self.unmodifiedRatio  # Same draw as is_unmodified
+
+            inventoryItem = {}
+            inventoryItem["id"] = projectID * 100000 + itemIndex
+            inventoryItem["name"] = "component-%s-%s" %(projectID, itemIndex)
+            inventoryItem["type"] = "Component"
+            inventoryItem["createdOn"] = createdOn
+            inventoryItem["updatedOn"] = createdOn if unmodified else "2023-06-%02d 10:00:00" %(1 + itemIndex % 28)
+            inventoryItem["selectedLicenseId"] = randomValues.randint(1, self.licenseCount)
+            inventoryItems.append(inventoryItem)
+
+        return inventoryItems
+
+    #---------------------------------------#
+    def is_unmodified(self, inventoryID):
+        projectID, itemIndex = divmod(inventoryID, 100000)
+        return self.get_random("item", projectID, itemIndex).random() < self.unmodifiedRatio
+
+    #---------------------------------------#
+    def get_inventory_history(self, inventoryID):
+        # An item never updated since it was created has no history of changes
+        inventoryHistory = {}
+        if self.is_unmodified(inventoryID):
+            return inventoryHistory
+
+        for eventIndex in range(self.eventsPerItem):
+            randomValues = self.get_random("event", inventoryID, eventIndex)
+            eventID = inventoryID * 100 + eventIndex
+
+            action = {}
+            action["field"] = "License" if randomValues.random() < 0.6 else randomValues.choice(["Version", "Review Status", "Component"])
+            action["date"] = "2023-%02d-%02d 12:00:00" %(2 + eventIndex % 10, 1 + eventIndex % 28)
+            action["user"] = "user%s" %randomValues.randint(1, 20)
+            action["userEmail"] = action["user"] + "@example.com"
+
+            if action["field"] == "License":
+                action["oldValue"] = str(randomValues.randint(1, self.licenseCount))
+                action["newValue"] = str(randomValues.randint(1, self.licenseCount))
+            else:
+                action["oldValue"] = "%s %s" %(action["field"], eventIndex)
+                action["newValue"] = "%s %s" %(action["field"], eventIndex + 1)
+
+            inventoryHistory[str(eventID)] = [action]
+
+        return inventoryHistory
+
+    #---------------------------------------#
+    def get_license(self, licenseID):
+        spdxIdentifier = "N/A" if licenseID % 5 == 0 else "LicenseRef-Benchmark-%s" %licenseID
+        return {"id" : licenseID, "name" : "Benchmark License %s" %licenseID, "shortName" : "Benchmark-%s" %licenseID, "spdxIdentifier" : spdxIdentifier}
+
+    #---------------------------------------#
+    def get_projects(self):
+        return [{"id" : projectID, "name" : projectName} for projectID, projectName in sorted(self.projectNames.items())]
+
+#------------------------------------------------------------------#
+def find_project(project, projectID):
+    if project["id"] == projectID:
+        return project
+    for childProject in project["childProject"]:
+        foundProject = find_project(childProject, projectID)
+        if foundProject is not None:
+            return foundProject
+    return None
+
+#------------------------------------------------------------------#
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+#------------------------------------------------------------------#
+class MockCodeInsightServer(object):
+    '''
+    Local stand in for the Code Insight REST API serving a SyntheticPortfolio.  Requests are
+    matched on the resource within the path rather than the exact URL so small differences
+    between versions of the REST API modules still resolve.  Every request waits latency
+    seconds and is counted per endpoint along with the bytes sent and received.
+    '''
+
+    # (endpoint, method, pattern) in the order they are matched against the request path
+    routes = [
+        ("upload", "POST", re.compile(r"/projects/(\d+)/reports/(\d+)")),
+        ("inventoryHistory", "GET", re.compile(r"/inventor(?:y|ies)/(\d+)/history")),
+        ("childProjects", "GET", re.compile(r"/projects?/(?:hierarchy/)?(\d+)/?(?:children|hierarchy|childProjects)|/hierarchy/(\d+)")),
+        ("inventorySummary", "GET", re.compile(r"/projects?/(\d+)/inventor(?:y|ies)(?:Summary)?")),
+        ("projectInformation", "GET", re.compile(r"/projects?/(\d+)(?:/information|/summary)?/?$")),
+        ("licenseLookup", "GET", re.compile(r"/licenses?/(\d+)")),
+        ("projects", "GET", re.compile(r"/projects/?$")),
+    ]
+
+    def __init__(self, portfolio, latency=0.0, port=0):
+        self.portfolio = portfolio
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requestCounts = {}
+        self.bytesSent = {}
+        self.bytesReceived = {}
+
+        mockServer = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Otherwise each keep-alive response waits on a delayed ACK
+
+            def do_GET(self):
+                mockServer.handle_request(self, "GET")
+
+            def do_POST(self):
+                mockServer.handle_request(self, "POST")
+
+            def log_message(self, format, *args):
+                logger.debug(format %args)
+
+        self.httpServer = ThreadingHTTPServer(("127.0.0.1", port), RequestHandler)
+        self.baseURL = "http://127.0.0.1:%s" %self.httpServer.server_port
+        self.serverThread = None
+
+    #---------------------------------------#
+    def start(self):
+        self.serverThread = threading.Thread(target=self.httpServer.serve_forever, name="MockCodeInsightServer", daemon=True)
+        self.serverThread.start()
+        logger.info("Mock Code Insight server listening on %s" %self.baseURL)
+        return self.baseURL
+
+    #---------------------------------------#
+    def stop(self):
+        self.httpServer.shutdown()
+        self.httpServer.server_close()
+
+    #---------------------------------------#
+    def handle_request(self, request, method):
+        path = request.path.split("?")[0]
+        bodySize = self.read_request_body(request)
+
+        # Statistics for the benchmark itself are neither delayed nor counted
+        if path == statisticsPath:
+            self.send_json(request, 200, json.dumps(self.get_statistics()).encode("utf-8"))
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        endpoint = "unknown"
+        responseData = None
+        for routeEndpoint, routeMethod, routePattern in self.routes:
+            match = routePattern.search(path)
+            if routeMethod == method and match:
+                endpoint = routeEndpoint
+                resourceID = next((int(value) for value in match.groups() if value is not None), None)
+                responseData = self.get_response_data(endpoint, resourceID)
+                break
+
+        if responseData is None:
+            logger.warning("No mock response for %s %s" %(method, request.path))
+            responseBody = json.dumps({"error" : "Not found"}).encode("utf-8")
+            statusCode = 404
+        else:
+            responseBody = json.dumps(responseData).encode("utf-8")
+            statusCode = 200
+
+        with self.lock:
+            self.requestCounts[endpoint] = self.requestCounts.get(endpoint, 0) + 1
+            self.bytesSent[endpoint] = self.bytesSent.get(endpoint, 0) + len(responseBody)
+            self.bytesReceived[endpoint] = self.bytesReceived.get(endpoint, 0) + bodySize
+
+        self.send_json(request, statusCode, responseBody)
+
+    #---------------------------------------#
+    def send_json(self, request, statusCode, responseBody):
+        request.send_response(statusCode)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(responseBody)))
+        request.end_headers()
+        request.wfile.write(responseBody)
+
+    #---------------------------------------#
+    def read_request_body(self, request):
+        # Uploads are read and discarded in blocks so large archives do not use memory
+        remaining = int(request.headers.get("Content-Length", 0) or 0)
+        bodySize = remaining
+        while remaining > 0:
+            block = request.rfile.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            remaining -= len(block)
+        return bodySize
+
+    #---------------------------------------#
+    def get_response_data(self, endpoint, resourceID):
+        if endpoint == "upload":
+            return {"data" : "Report uploaded"}
+        elif endpoint == "childProjects":
+            project = self.portfolio.get_child_projects(resourceID)
+            return None if project is None else {"data" : project}
+        elif endpoint == "inventorySummary":
+            inventoryItems = self.portfolio.get_inventory_summary(resourceID)
+            return {"data" : inventoryItems, "currentPage" : 1, "totalPages" : 1, "totalRecords" : len(inventoryItems)}
+        elif endpoint == "projectInformation":
+            return {"data" : self.portfolio.get_project_information(resourceID)}
+        elif endpoint == "inventoryHistory":
+            inventoryHistory = self.portfolio.get_inventory_history(resourceID)
+            return {"data" : inventoryHistory, "currentPage" : 1, "totalPages" : 1, "totalRecords" : len(inventoryHistory)}
+        elif endpoint == "licenseLookup":
+            return {"data" : self.portfolio.get_license(resourceID)}
+        elif endpoint == "projects":
+            return {"data" : self.portfolio.get_projects()}
+        return None
+
+    #---------------------------------------#
+    def get_statistics(self):
+        with self.lock:
+            statistics = {}
+            for endpoint in sorted(self.requestCounts):
+                statistics[endpoint] = {"requests" : self.requestCounts[endpoint], "bytesSent" : self.bytesSent[endpoint], "bytesReceived" : self.bytesReceived[endpoint]}
+            return statistics
+
+#------------------------------------------------------------------#
+def main(arguments=None):
+    args = parser.parse_args(arguments)
+
+    portfolio = SyntheticPortfolio(args.depth, args.width, args.items, args.events, args.licenses, args.unmodified)
+    mockServer = MockCodeInsightServer(portfolio, args.latency, args.port)
+
+    # The first line written is the base URL so a parent process can wait for the server
+    print(mockServer.baseURL, flush=True)
+
+    try:
+        mockServer.httpServer.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mockServer.httpServer.server_close()
+
+#------------------------------------------------------------------#
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : run_benchmark.py
+'''
+import sys, os, logging, argparse, json, time, tempfile, shutil, subprocess
+from urllib.request import urlopen
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+benchmarkDirectory = os.path.dirname(os.path.realpath(__file__))
+reportDirectory = os.path.dirname(benchmarkDirectory)
+sys.path.insert(0, reportDirectory)
+
+import mock_codeinsight
+import create_report
+import report_settings
+import report_metrics
+
+logger = logging.getLogger(__name__)
+
+###################################################################################
+# Create command line argument options
+parser = argparse.ArgumentParser(description="Run create_report.py end to end against a local mock Code Insight server")
+parser.add_argument("--depth", type=int, default=2, help="Levels of child projects below the root project")
+parser.add_argument("--width", type=int, default=3, help="Child projects of each project")
+parser.add_argument("--items", type=int, default=50, help="Inventory items per project")
+parser.add_argument("--events", type=int, default=5, help="History events per inventory item")
+parser.add_argument("--licenses", type=int, default=40, help="Distinct licenses used by the events")
+parser.add_argument("--unmodified", type=float, default=0.25, help="Share of inventory items never updated since they were created")
+parser.add_argument("--latency", type=float, default=0.005, help="Seconds added to every request by the mock server")
+parser.add_argument("--requestsPerSecond", type=float, help="Override the rate limit of report_settings.py (0 to disable)")
+parser.add_argument("--historyCache", action="store_true", help="Keep the inventory histories within the report cache between runs")
+parser.add_argument("--runs", type=int, default=1, help="Number of report runs.  Later runs reuse the report cache of the earlier runs")
+parser.add_argument("--reportOptions", default='{"includeChildProjects": "true", "restrictedLicensesOnly": "false"}', help="Report options passed to create_report.py")
+parser.add_argument("--output", help="Write the results as json to this file")
+
+#----------------------------------------------------------------------#
+def main():
+    args = parser.parse_args()
+
+    portfolio = mock_codeinsight.SyntheticPortfolio(args.depth, args.width, args.items, args.events, args.licenses, args.unmodified)
+    print("Benchmark portfolio: %s projects  %s inventory items  %s history events" %(len(portfolio.projectNames), len(portfolio.projectNames) * args.items, len(portfolio.projectNames) * args.items * args.events))
+
+    # The server runs in its own process so it does not compete with the report for the GIL
+    serverArguments = ["--depth", args.depth, "--width", args.width, "--items", args.items, "--events", args.events, "--licenses", args.licenses, "--unmodified", args.unmodified, "--latency", args.latency]
+    serverProcess = subprocess.Popen([sys.executable, mock_codeinsight.__file__] + [str(argument) for argument in serverArguments], stdout=subprocess.PIPE, universal_newlines=True)
+    baseURL = serverProcess.stdout.readline().strip()
+    if not baseURL:
+        raise RuntimeError("Mock Code Insight server did not start")
+    print("Mock Code Insight server listening on %s" %baseURL)
+
+    # Keep the report artifacts, cache and server details out of the report directory
+    workDirectory = tempfile.mkdtemp(prefix="report_benchmark_")
+    originalDirectory = os.getcwd()
+
+    propertiesFile = os.path.join(workDirectory, "server_properties.json")
+    with open(propertiesFile, "w") as file_ptr:
+        json.dump({"core.server.url" : baseURL}, file_ptr)
+
+    create_report.propertiesFile = propertiesFile
+    report_settings.cacheFile = os.path.join(workDirectory, "_report_cache.db")
+
+    # The rate limit protecting a production server would otherwise dominate the timings
+    if args.requestsPerSecond is not None:
+        report_settings.requestsPerSecond = args.requestsPerSecond
+
+    if args.historyCache:
+        report_settings.historyCacheEnabled = True
+
+    results = {}
+    results["portfolio"] = vars(args)
+    results["runs"] = []
+
+    try:
+        os.chdir(workDirectory)
+
+        for run in range(1, args.runs + 1):
+            requestCountsBefore = get_server_statistics(baseURL)
+
+            sys.argv = ["create_report.py", "-pid", "1", "-rid", "1", "-authToken", "benchmark", "-reportOpts", get_framework_report_options(args.reportOptions)]
+            startTime = time.perf_counter()
+            create_report.main()
+            wallTime = time.perf_counter() - startTime
+
+            runResults = {}
+            runResults["run"] = run
+            runResults["wallTime"] = round(wallTime, 3)
+            # The timings and request latencies measured by the report itself
+            reportMetrics = report_metrics.metrics.get_summary()
+            runResults["phases"] = {phase : phaseDetails["seconds"] for phase, phaseDetails in reportMetrics["phases"].items()}
+            runResults["latencies"] = {endpoint : endpointSummary["latency"] for endpoint, endpointSummary in reportMetrics["endpoints"].items()}
+            runResults["requests"] = get_statistics_delta(requestCountsBefore, get_server_statistics(baseURL))
+            runResults["peakRSS"] = get_peak_rss()
+            results["runs"].append(runResults)
+
+            print_run_results(runResults)
+    finally:
+        os.chdir(originalDirectory)
+        serverProcess.terminate()
+        serverProcess.wait()
+        shutil.rmtree(workDirectory, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as file_ptr:
+            json.dump(results, file_ptr, indent=4)
+        print("Results written to %s" %args.output)
+
+#----------------------------------------------------------------------#
+def get_framework_report_options(reportOptions):
+    # On linux the report framework passes the options quoted with doubled quotes
+    if sys.platform.startswith('linux'):
+        return '"' + reportOptions.replace('"', '""') + '"'
+    return reportOptions
+
+#----------------------------------------------------------------------#
+def get_server_statistics(baseURL):
+    with urlopen(baseURL + mock_codeinsight.statisticsPath) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+#----------------------------------------------------------------------#
+def get_statistics_delta(statisticsBefore, statisticsAfter):
+    statisticsDelta = {}
+    for endpoint, endpointStatistics in statisticsAfter.items():
+        previousStatistics = statisticsBefore.get(endpoint, {})
+        statisticsDelta[endpoint] = {key : value - previousStatistics.get(key, 0) for key, value in endpointStatistics.items()}
+    return statisticsDelta
+
+#----------------------------------------------------------------------#
+def get_peak_rss():
+    # Peak resident set size in MB of the report and its artifact worker process
+    if resource is None:
+        return None
+
+    peakRSS = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    # Reported in bytes on macOS and kilobytes elsewhere
+    if sys.platform == "darwin":
+        return round(peakRSS / (1024 * 1024), 1)
+    return round(peakRSS / 1024, 1)
+
+#----------------------------------------------------------------------#
+def print_run_results(runResults):
+    print("")
+    print("Run %s" %runResults["run"])
+    print("    Wall time:  %.3fs" %runResults["wallTime"])
+    print("    Peak RSS:   %s MB" %runResults["peakRSS"])
+    # Phases run by the concurrent history workers are summed over the workers
+    for phase, phaseTime in runResults["phases"].items():
+        print("    %-26s %.3fs" %(phase + ":", phaseTime))
+    print("    Client latency:")
+    for endpoint, latency in runResults["latencies"].items():
+        print("        %-60s p50 %.4fs  p90 %.4fs  p99 %.4fs" %(endpoint, latency["p50"], latency["p90"], latency["p99"]))
+    print("    Requests:")
+    for endpoint, endpointStatistics in runResults["requests"].items():
+        if endpointStatistics["requests"]:
+            print("        %-20s %6s requests  %10s bytes sent  %10s bytes received" %(endpoint, endpointStatistics["requests"], endpointStatistics["bytesSent"], endpointStatistics["bytesReceived"]))
+
+#----------------------------------------------------------------------#
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : create_batch_reports.py
+'''
+import sys, logging, argparse, json, re
+
+import _version
+import create_report
+import report_data
+import report_session
+import license_resolver
+import report_profiler
+
+logger = logging.getLogger(__name__)
+
+###################################################################################
+# Create command line argument options
+parser = argparse.ArgumentParser(description="Generate and upload the report for many projects within a single process")
+parser.add_argument('-pids', "--projectIDs", help="Comma separated list of project IDs")
+parser.add_argument("-projectFilter", "--projectFilter", help="Regular expression selecting projects by name")
+parser.add_argument("-rid", "--reportID", help="Report ID", required=True)
+parser.add_argument("-authToken", "--authToken", help="Code Insight Authorization Token", required=True)
+parser.add_argument("-reportOpts", "--reportOptions", help="Options for report content", default='{"includeChildProjects": "true", "restrictedLicensesOnly": "false"}')
+
+#----------------------------------------------------------------------#
+def main():
+
+    logger.info("Creating %s for multiple projects - %s" %(create_report.reportName, _version.__version__))
+    print("Creating %s for multiple projects - %s" %(create_report.reportName, _version.__version__))
+    print("    Logfile: %s" %(create_report.logfileName))
+
+    args = parser.parse_args()
+    reportID = args.reportID
+    authToken = args.authToken
+    reportOptions = json.loads(args.reportOptions)
+
+    if not args.projectIDs and not args.projectFilter:
+        parser.error("Either -pids or -projectFilter is required")
+
+    baseURL = create_report.get_base_url()
+
+    # The connection pool, license names and project data are shared by every report
+    report_session.install_shared_session()
+    license_resolver.enable_shared_resolvers()
+    report_data.enable_shared_project_collection()
+
+    failedProjectIDs = []
+
+    try:
+        projectIDs = get_project_ids(baseURL, authToken, args.projectIDs, args.projectFilter)
+
+        logger.info("Generating reports for %s projects" %len(projectIDs))
+        print("    Generating reports for %s projects" %len(projectIDs))
+
+        # Only the projects included within more than one report are kept between the reports
+        try:
+            verifiedOptions = create_report.verifyOptions(dict(reportOptions))
+            if "errorMsg" not in verifiedOptions:
+                report_data.plan_shared_project_collection(baseURL, projectIDs, authToken, verifiedOptions["includeChildProjects"])
+        except Exception:
+            logger.exception("Unable to determine the projects shared by the reports")
+
+        for projectID in projectIDs:
+            logger.info("Generating report for project %s" %projectID)
+            print("Generating report for project %s" %projectID)
+
+            # A failure for one project should not stop the reports for the others
+            try:
+                if not create_report.generate_report(baseURL, projectID, reportID, authToken, dict(reportOptions)):
+                    failedProjectIDs.append(projectID)
+            except Exception:
+                logger.exception("Unable to generate the report for project %s" %projectID)
+                print("    *** ERROR  ***  Unable to generate the report for project %s" %projectID)
+                failedProjectIDs.append(projectID)
+            finally:
+                report_data.release_shared_projects(projectID)
+    finally:
+        report_data.close_shared_project_collection()
+        license_resolver.close_shared_resolvers()
+        report_session.close_shared_session()
+
+    if failedProjectIDs:
+        logger.error("Reports for projects %s were not created successfully" %failedProjectIDs)
+        print("Reports for %s of %s projects were not created successfully: %s" %(len(failedProjectIDs), len(projectIDs), ", ".join(str(projectID) for projectID in failedProjectIDs)))
+        sys.exit(1)
+
+    print("Reports for %s projects have been created" %len(projectIDs))
+
+#----------------------------------------------------------------------#
+def get_project_ids(baseURL, authToken, projectIDs, projectFilter):
+    logger.info("Entering get_project_ids")
+
+    selectedProjectIDs = []
+
+    if projectIDs:
+        selectedProjectIDs += [projectID.strip() for projectID in projectIDs.split(",") if projectID.strip()]
+
+    if projectFilter:
+        projectNameFilter = re.compile(projectFilter)
+        for project in get_all_projects(baseURL, authToken):
+            if projectNameFilter.search(project["name"]):
+                selectedProjectIDs.append(str(project["id"]))
+
+    # Keep the requested order but only create each report once
+    uniqueProjectIDs = []
+    for projectID in selectedProjectIDs:
+        if projectID not in uniqueProjectIDs:
+            uniqueProjectIDs.append(projectID)
+
+    return uniqueProjectIDs
+
+#----------------------------------------------------------------------#
+def get_all_projects(baseURL, authToken):
+    logger.info("Entering get_all_projects")
+
+    RESTAPI_URL = baseURL + "/codeinsight/api/projects"
+    headers = {'Content-Type': 'application/json', 'Authorization': 'Bearer ' + authToken}
+
+    response = report_session.sharedSession.get(RESTAPI_URL, headers=headers)
+    response.raise_for_status()
+
+    projects = response.json()
+    if isinstance(projects, dict):
+        projects = projects["data"]
+
+    logger.info("    %s projects available" %len(projects))
+
+    return projects
+
+#----------------------------------------------------------------------#
+if __name__ == "__main__":
+    report_profiler.run_profiled(main, create_report.logfileName)
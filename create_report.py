@@ -10,12 +10,18 @@ File : create_report.py
 import sys, os, logging, argparse, json, re
 from datetime import datetime
 import zipfile
+import shutil
+import tempfile
 
 import _version
 import report_data
 import report_artifacts
 import report_errors
-import CodeInsight_RESTAPIs.project.upload_reports
+import report_session
+import report_settings
+import report_upload
+import report_metrics
+import report_profiler
 
 ###################################################################################
 # Test the version of python to make sure it's at least the version the script
@@ -29,6 +35,8 @@ propertiesFile = "../server_properties.json"  # Created by installer or manually
 propertiesFile = logfileName = os.path.dirname(os.path.realpath(__file__)) + "/" +  propertiesFile
 logfileName = os.path.dirname(os.path.realpath(__file__)) + "/_project_inventory_license_audit_report.log"
 
+reportName = "Project Inventory License Audit Report"
+
 ###################################################################################
 #  Set up logging handler to allow for different levels of logging to be capture
 logging.basicConfig(format='%(asctime)s,%(msecs)d %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s', datefmt='%Y-%m-%d:%H:%M:%S', filename=logfileName, filemode='w',level=logging.DEBUG)
@@ -48,13 +56,35 @@ parser.add_argument("-reportOpts", "--reportOptions", help="Options for report c
 #----------------------------------------------------------------------#
 def main():
 
-    reportName = "Project Inventory License Audit Report"
-    auditField = "License"
-
     logger.info("Creating %s - %s" %(reportName, _version.__version__))
     print("Creating %s - %s" %(reportName, _version.__version__))
     print("    Logfile: %s" %(logfileName))
 
+    baseURL = get_base_url()
+
+    # See what if any arguments were provided
+    args = parser.parse_args()
+    projectID = args.projectID
+    reportID = args.reportID
+    authToken = args.authToken
+    reportOptions = args.reportOptions
+
+    # Based on how the shell pass the arguemnts clean up the options if on a linux system:w
+    if sys.platform.startswith('linux'):
+        reportOptions = reportOptions.replace('""', '"')[1:-1]
+
+    reportOptions = json.loads(reportOptions)
+
+    # All REST calls made by the report share a pool of keep-alive connections
+    report_session.install_shared_session()
+
+    try:
+        generate_report(baseURL, projectID, reportID, authToken, reportOptions)
+    finally:
+        report_session.close_shared_session()
+
+#----------------------------------------------------------------------#
+def get_base_url():
     #####################################################################################################
     #  Code Insight System Information
     #  Pull the base URL from the same file that the installer is creating
@@ -80,18 +110,17 @@ def main():
         baseURL = "http://localhost:8888"   # Required if the core.server.properties files is not used
         logger.info("Using baseURL from create_report.py")
 
-    # See what if any arguments were provided
-    args = parser.parse_args()
-    projectID = args.projectID
-    reportID = args.reportID
-    authToken = args.authToken
-    reportOptions = args.reportOptions
+    return baseURL
 
-    # Based on how the shell pass the arguemnts clean up the options if on a linux system:w
-    if sys.platform.startswith('linux'):
-        reportOptions = reportOptions.replace('""', '"')[1:-1]
+#----------------------------------------------------------------------#
+def generate_report(baseURL, projectID, reportID, authToken, reportOptions):
+    # Collect the data for a single project, create the report artifacts and upload them
+
+    auditFields = report_settings.auditFields
+
+    # Each report has its own timings and request statistics
+    reportMetrics = report_metrics.reset_metrics()
 
-    reportOptions = json.loads(reportOptions)
     reportOptions = verifyOptions(reportOptions) 
 
     logger.debug("Custom Report Provided Arguments:")	
@@ -115,16 +144,21 @@ def main():
         reports = report_errors.create_error_report(reportData)
         print("    *** ERROR  ***  Error found validating report options")
     else:
-        reportData = report_data.gather_data_for_report(baseURL, projectID, authToken, reportName, reportOptions, auditField)
-        print("    Report data has been collected")
-        projectName = reportData["projectName"]
-        projectNameForFile = re.sub(r"[^a-zA-Z0-9]+", '-', projectName )  # Remove special characters from project name for artifacts
-        
-        # Are there child projects involved?  If so have the artifact file names reflect this fact
-        if len(reportData["projectList"])==1:
-            reportFileNameBase = projectNameForFile + "-" + str(projectID) + "-" + reportName.replace(" ", "_") + "-" + fileNameTimeStamp
+        reportData = report_data.gather_data_for_report(baseURL, projectID, authToken, reportName, reportOptions, auditFields, reportID)
+
+        if "projectName" not in reportData:
+            # The project hierarchy could not be collected so the project name is not known
+            reportFileNameBase = reportName.replace(" ", "_") + "-Creation_Error-" + fileNameTimeStamp
         else:
-            reportFileNameBase = projectNameForFile + "-with-children-" + str(projectID) + "-" + reportName.replace(" ", "_") + "-" + fileNameTimeStamp
+            print("    Project hierarchy has been collected")
+            projectName = reportData["projectName"]
+            projectNameForFile = re.sub(r"[^a-zA-Z0-9]+", '-', projectName )  # Remove special characters from project name for artifacts
+            
+            # Are there child projects involved?  If so have the artifact file names reflect this fact
+            if len(reportData["projectList"])==1:
+                reportFileNameBase = projectNameForFile + "-" + str(projectID) + "-" + reportName.replace(" ", "_") + "-" + fileNameTimeStamp
+            else:
+                reportFileNameBase = projectNameForFile + "-with-children-" + str(projectID) + "-" + reportName.replace(" ", "_") + "-" + fileNameTimeStamp
 
         reportData["fileNameTimeStamp"] = fileNameTimeStamp
         reportData["reportTimeStamp"] = datetime.strptime(fileNameTimeStamp, "%Y%m%d-%H%M%S").strftime("%B %d, %Y at %H:%M:%S")
@@ -135,17 +169,38 @@ def main():
             reports = report_errors.create_error_report(reportData)
             print("    Error report artifacts have been created")
         else:
+            # The audit history is collected as the artifacts are being written
             reports = report_artifacts.create_report_artifacts(reportData)
-            print("    Report artifacts have been created")
+
+            # Anything that could not be collected would leave the report incomplete
+            if reportData["collectionErrors"]:
+                remove_report_artifacts(reports)
+                reportData["errorMsg"] = reportData["collectionErrors"]
+                reports = report_errors.create_error_report(reportData)
+                print("    *** ERROR  ***  Unable to collect all of the report data")
+            else:
+                print("    Report data has been collected and report artifacts have been created")
+
+    # The archive and upload timings are only within the log as they happen after this file is written
+    if report_settings.writeReportMetrics:
+        reports["allFormats"].append(reportMetrics.write_metrics_file(reportFileNameBase + "-metrics.json"))
 
     print("    Create report archive for upload")
-    uploadZipfile = create_report_zipfile(reports, reportFileNameBase)
+    with reportMetrics.phase("archive"):
+        uploadZipfile = create_report_zipfile(reports, reportFileNameBase)
     print("    Upload zip file creation completed")
 
 
     #########################################################
     # Upload the file to Code Insight
-    CodeInsight_RESTAPIs.project.upload_reports.upload_project_report_data(baseURL, projectID, reportID, authToken, uploadZipfile)
+    # The archive is streamed to the server rather than being read into memory
+    with reportMetrics.phase("upload"):
+        uploaded = report_upload.upload_project_report_data(baseURL, projectID, reportID, authToken, uploadZipfile)
+
+    reportMetrics.log_summary()
+
+    # Let the caller know if the report, rather than the error report, was uploaded
+    return uploaded and "errorMsg" not in reportData
 
 
 
@@ -182,13 +237,23 @@ def verifyOptions(reportOptions):
 
     return reportOptions
 
+#---------------------------------------------------------------------#
+def remove_report_artifacts(reportOutputs):
+	for fileName in reportOutputs["allFormats"]:
+		try:
+			os.remove(fileName)
+		except OSError:
+			logger.error("Error removing %s" %fileName)
+
 #---------------------------------------------------------------------#
 def create_report_zipfile(reportOutputs, reportFileNameBase):
 	logger.info("Entering create_report_zipfile")
 	allFormatZipFile = reportFileNameBase + ".zip"
 
-	# create a ZipFile object
-	allFormatsZip = zipfile.ZipFile(allFormatZipFile, 'w', zipfile.ZIP_DEFLATED)
+	# The downloadable archive is built in memory, or a temporary file once it is large,
+	# rather than being written to disk and read back again
+	allFormatsBuffer = tempfile.SpooledTemporaryFile(max_size=report_settings.archiveSpoolSize)
+	allFormatsZip = open_report_zipfile(allFormatsBuffer)
 
 	logger.debug("    Create downloadable archive: %s" %allFormatZipFile)
 	print("    Create downloadable archive: %s" %allFormatZipFile)
@@ -205,21 +270,23 @@ def create_report_zipfile(reportOutputs, reportFileNameBase):
 	uploadZipflle = allFormatZipFile.replace(".zip", "_upload.zip")
 	print("    Create zip archive containing viewable and downloadable archive for upload: %s" %uploadZipflle)
 	logger.debug("    Create zip archive containing viewable and downloadable archive for upload: %s" %uploadZipflle)
-	zipToUpload = zipfile.ZipFile(uploadZipflle, 'w', zipfile.ZIP_DEFLATED)
+	zipToUpload = open_report_zipfile(uploadZipflle)
 	zipToUpload.write(reportOutputs["viewable"])
-	zipToUpload.write(allFormatZipFile)
+
+	# The downloadable archive is already compressed so it is stored as is
+	allFormatsInfo = zipfile.ZipInfo(allFormatZipFile, date_time=datetime.now().timetuple()[:6])
+	allFormatsInfo.compress_type = zipfile.ZIP_STORED
+	allFormatsInfo.file_size = allFormatsBuffer.tell()
+	allFormatsBuffer.seek(0)
+	with zipToUpload.open(allFormatsInfo, "w") as zip_ptr:
+		shutil.copyfileobj(allFormatsBuffer, zip_ptr, 1024 * 1024)
+	allFormatsBuffer.close()
+
 	zipToUpload.close()
 	logger.debug("    Archive zip file for upload has been created")
 	print("        Archive zip file for upload has been created")
 
 	# Clean up the items that were added to the zipfile
-	try:
-		os.remove(allFormatZipFile)
-	except OSError:
-		logger.error("Error removing %s" %allFormatZipFile)
-		print("Error removing %s" %allFormatZipFile)
-		return -1
-
 	for fileName in reportOutputs["allFormats"]:
 		try:
 			os.remove(fileName)
@@ -232,6 +299,13 @@ def create_report_zipfile(reportOutputs, reportFileNameBase):
 	return uploadZipflle
 
         
+#---------------------------------------------------------------------#
+def open_report_zipfile(file):
+	# The compression level can only be set from python 3.7
+	if sys.version_info >= (3, 7):
+		return zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED, compresslevel=report_settings.archiveCompressionLevel)
+	return zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED)
+
 #----------------------------------------------------------------------#    
 if __name__ == "__main__":
-    main()  
\ No newline at end of file
+    report_profiler.run_profiled(main, logfileName)  
\ No newline at end of file
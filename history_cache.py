@@ -0,0 +1,73 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : history_cache.py
+'''
+import logging
+import threading
+
+import report_cache
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class InventoryHistoryCache(object):
+    '''
+    Inventory history responses kept between report runs.  Each entry holds the change token
+    of the inventory item when the history was collected so the history is only reused while
+    the item is unchanged.  New entries are written in batches as they are collected on the
+    history workers.
+    '''
+
+    def __init__(self, baseURL):
+        namespace = report_cache.get_server_namespace("inventoryHistory", baseURL)
+        self.cache = report_cache.ReportCache(report_settings.cacheFile, namespace, compress=True, maxSize=report_settings.historyCacheMaxSize)
+        self.pendingEntries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    #---------------------------------------#
+    def get(self, inventoryID, changeToken):
+        cachedEntry = self.cache.get(inventoryID)
+
+        with self.lock:
+            if cachedEntry is not None and cachedEntry[0] == changeToken:
+                self.hits += 1
+                return cachedEntry[1]
+            self.misses += 1
+
+        return None
+
+    #---------------------------------------#
+    def add(self, inventoryID, changeToken, inventoryHistory):
+        with self.lock:
+            self.pendingEntries[inventoryID] = [changeToken, inventoryHistory]
+            if len(self.pendingEntries) < report_settings.historyCacheWriteBatchSize:
+                return
+            pendingEntries, self.pendingEntries = self.pendingEntries, {}
+
+        self.cache.set_many(pendingEntries)
+
+    #---------------------------------------#
+    def close(self):
+        with self.lock:
+            pendingEntries, self.pendingEntries = self.pendingEntries, {}
+
+        if pendingEntries:
+            self.cache.set_many(pendingEntries)
+        self.cache.close()
+
+        logger.info("Inventory history cache:  %s reused  %s collected" %(self.hits, self.misses))
+        print("    Inventory history reused from the cache: %s of %s" %(self.hits, self.hits + self.misses))
+
+#------------------------------------------------------------------#
+def open_history_cache(baseURL):
+    if not report_settings.historyCacheEnabled:
+        return None
+    return InventoryHistoryCache(baseURL)
@@ -0,0 +1,69 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : incremental_state.py
+'''
+import logging
+
+import report_cache
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+missingInventoryFields = set()  # Inventory summary fields already reported as missing
+
+#------------------------------------------------------------------#
+def get_state_key(baseURL, projectID, reportOptions, auditFields, restrictedLicensePolicy):
+    # The stored events depend on the report options so keep a separate state for each combination
+    return "|".join(["incremental", baseURL, str(projectID), "+".join(auditFields), str(reportOptions["restrictedLicensesOnly"]), restrictedLicensePolicy.fingerprint])
+
+#------------------------------------------------------------------#
+def load_project_state(stateKey):
+    logger.debug("Entering load_project_state.")
+
+    stateCache = report_cache.ReportCache(report_settings.cacheFile, stateKey)
+    try:
+        projectState = stateCache.get_all()
+    finally:
+        stateCache.close()
+
+    logger.debug("    %s inventory items with stored audit events for %s" %(len(projectState), stateKey))
+
+    return projectState
+
+#------------------------------------------------------------------#
+def save_project_state(stateKey, projectState):
+    logger.debug("Entering save_project_state.")
+
+    # Replace the complete state so items removed from the project do not linger
+    stateCache = report_cache.ReportCache(report_settings.cacheFile, stateKey)
+    try:
+        stateCache.clear()
+        stateCache.set_many(projectState)
+    finally:
+        stateCache.close()
+
+#------------------------------------------------------------------#
+def get_inventory_change_token(inventoryItem):
+    # Any edit of an inventory item updates its last updated timestamp so combine that with
+    # the selected license.  Without a timestamp there is no way to tell if the history changed
+    lastUpdated = get_inventory_field(inventoryItem, report_settings.inventoryLastUpdatedField)
+    if not lastUpdated:
+        return None
+
+    return "%s|%s" %(lastUpdated, inventoryItem.get("selectedLicenseId", ""))
+
+#------------------------------------------------------------------#
+def get_inventory_field(inventoryItem, fieldName):
+    # Warn once per field rather than for every inventory item
+    fieldValue = inventoryItem.get(fieldName)
+
+    if not fieldValue and fieldName not in missingInventoryFields:
+        missingInventoryFields.add(fieldName)
+        logger.warning("Inventory summary field %s is missing for inventory item %s.  The history of items without it is always collected" %(fieldName, inventoryItem.get("id")))
+
+    return fieldValue
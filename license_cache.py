@@ -0,0 +1,42 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : license_cache.py
+'''
+import logging
+
+import report_cache
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+def open_license_cache(baseURL):
+    namespace = report_cache.get_server_namespace("licenses", baseURL)
+    return report_cache.ReportCache(report_settings.cacheFile, namespace, report_settings.licenseCacheTimeToLive)
+
+#------------------------------------------------------------------#
+def load_license_mappings(licenseCache):
+    logger.info("Entering load_license_mappings")
+
+    licenseMappings = licenseCache.get_all()
+
+    logger.info("    %s license mappings loaded from %s" %(len(licenseMappings), report_settings.cacheFile))
+
+    return licenseMappings
+
+#------------------------------------------------------------------#
+def save_license_mappings(licenseCache, licenseMappings):
+    logger.info("Entering save_license_mappings")
+
+    # Only store the new names so existing entries still expire based on when they were looked up
+    cachedMappings = licenseCache.get_all()
+    newMappings = {licenseID : licenseName for licenseID, licenseName in licenseMappings.items() if cachedMappings.get(licenseID) != licenseName}
+
+    licenseCache.set_many(newMappings)
+
+    logger.info("    %s new license mappings saved to %s" %(len(newMappings), report_settings.cacheFile))
@@ -0,0 +1,125 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : license_policy.py
+'''
+import logging
+import os
+import re
+import json
+import hashlib
+
+import report_settings
+import restricted_licenses
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class RestrictedLicensePolicy(object):
+    '''
+    Compiled set of restricted license rules.  Code Insight license IDs are matched directly
+    while SPDX identifiers and family wildcards (i.e. GPL-*) are matched against the license
+    name, which is only resolved when name based rules exist.  Each license ID is evaluated
+    once and the decision is memoized.
+    '''
+
+    def __init__(self, licenseIDs, spdxIdentifiers, spdxWildcards, reportRestrictedToRestricted):
+        self.licenseIDs = frozenset(str(licenseID) for licenseID in licenseIDs)
+        self.spdxIdentifiers = frozenset(spdxIdentifier.lower() for spdxIdentifier in spdxIdentifiers)
+        self.spdxPrefixes = tuple(sorted(set(spdxWildcard.rstrip("*").lower() for spdxWildcard in spdxWildcards)))
+        self.reportRestrictedToRestricted = reportRestrictedToRestricted
+        self.nameRulesDefined = bool(self.spdxIdentifiers or self.spdxPrefixes)
+        self.decisions = {}
+
+        # Used to tell if results stored from a previous run were created with the same rules
+        policyDetails = [sorted(self.licenseIDs), sorted(self.spdxIdentifiers), list(self.spdxPrefixes), reportRestrictedToRestricted]
+        self.fingerprint = hashlib.sha1(json.dumps(policyDetails).encode("utf-8")).hexdigest()[:12]
+
+    #---------------------------------------#
+    def is_restricted_name(self, licenseName):
+        licenseName = licenseName.lower()
+        return licenseName in self.spdxIdentifiers or licenseName.startswith(self.spdxPrefixes)
+
+    #---------------------------------------#
+    def compile(self, licenseMappings):
+        # Decide up front for every license whose name is already known so most
+        # events are evaluated without ever needing the license name
+        for licenseID, licenseName in licenseMappings.items():
+            self.decisions[licenseID] = licenseID in self.licenseIDs or (self.nameRulesDefined and self.is_restricted_name(licenseName))
+
+    #---------------------------------------#
+    def is_restricted(self, licenseID, resolveLicenseName):
+        decision = self.decisions.get(licenseID)
+
+        if decision is None:
+            if licenseID in self.licenseIDs:
+                decision = True
+            elif self.nameRulesDefined:
+                decision = self.is_restricted_name(resolveLicenseName(licenseID))
+            else:
+                decision = False
+            self.decisions[licenseID] = decision
+
+        return decision
+
+    #---------------------------------------#
+    def is_reportable_change(self, oldLicenseID, newLicenseID, resolveLicenseName):
+        # Changes are of interest when moving away from a restricted license
+        if not self.is_restricted(oldLicenseID, resolveLicenseName):
+            return False
+
+        if self.reportRestrictedToRestricted:
+            return True
+
+        return not self.is_restricted(newLicenseID, resolveLicenseName)
+
+#------------------------------------------------------------------#
+def load_restricted_license_policy():
+    logger.info("Entering load_restricted_license_policy")
+
+    # The license IDs within restricted_licenses.py are always part of the policy
+    licenseIDs = list(restricted_licenses.restrictedLicenses.keys())
+    spdxIdentifiers = []
+    spdxWildcards = []
+    reportRestrictedToRestricted = True
+
+    policyFile = report_settings.restrictedLicensePolicyFile
+    if os.path.exists(policyFile):
+        try:
+            file_ptr = open(policyFile, "r")
+            policyData = json.load(file_ptr)
+            file_ptr.close()
+        except:
+            logger.error("Unable to load restricted license policy file: %s" %policyFile)
+            raise
+
+        licenseIDs += policyData.get("licenseIDs", [])
+        spdxIdentifiers += policyData.get("spdxIdentifiers", [])
+        spdxWildcards += policyData.get("spdxWildcards", [])
+        reportRestrictedToRestricted = policyData.get("reportRestrictedToRestricted", True)
+    else:
+        logger.info("    No restricted license policy file found at %s" %policyFile)
+
+    restrictedLicensePolicy = RestrictedLicensePolicy(licenseIDs, spdxIdentifiers, spdxWildcards, reportRestrictedToRestricted)
+    restrictedLicensePolicy.compile(get_restricted_license_names())
+
+    logger.info("    Restricted license policy: %s license IDs  %s SPDX identifiers  %s wildcards" %(len(restrictedLicensePolicy.licenseIDs), len(restrictedLicensePolicy.spdxIdentifiers), len(restrictedLicensePolicy.spdxPrefixes)))
+
+    return restrictedLicensePolicy
+
+#------------------------------------------------------------------#
+def get_restricted_license_names():
+    # i.e. "GNU General Public License v2.0 only (GPL-2.0-only)" maps to GPL-2.0-only.  These names
+    # only decide the policy up front and are never shown within the report
+    licenseNames = {}
+
+    for licenseID, licenseDescription in restricted_licenses.restrictedLicenses.items():
+        spdxIdentifier = re.search(r"\(([^()]+)\)\s*$", licenseDescription)
+        if spdxIdentifier:
+            licenseNames[licenseID] = spdxIdentifier.group(1)
+
+    return licenseNames
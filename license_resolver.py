@@ -0,0 +1,145 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : license_resolver.py
+'''
+import logging
+import threading
+
+import license_cache
+
+logger = logging.getLogger(__name__)
+
+sharedResolvers = None  # Resolvers kept open for every report generated by a batch run
+
+#------------------------------------------------------------------#
+class LicenseResolver(object):
+    '''
+    Map Code Insight license IDs to the name displayed within the report.  Every resolved
+    name is memoized regardless of whether it came from the SPDX identifier or the short name
+    and is persisted to the license cache when the resolver is closed.
+    '''
+
+    def __init__(self, baseURL, licenseLookup):
+        self.licenseLookup = licenseLookup  # Function taking a license ID and returning the license details
+        self.licenseCache = license_cache.open_license_cache(baseURL)
+        self.licenseMappings = license_cache.load_license_mappings(self.licenseCache)
+        self.pendingLookups = {} # Event for each license ID being looked up by another thread
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    #---------------------------------------#
+    def resolve(self, licenseID):
+        # The history workers resolve concurrently so an ID is only looked up by the first of them
+        while True:
+            with self.lock:
+                if licenseID in self.licenseMappings:
+                    self.hits += 1
+                    return self.licenseMappings[licenseID]
+
+                pendingLookup = self.pendingLookups.get(licenseID)
+                if pendingLookup is None:
+                    pendingLookup = threading.Event()
+                    self.pendingLookups[licenseID] = pendingLookup
+                    self.misses += 1
+                    break
+
+            # Try again once the other lookup completes, or failed
+            pendingLookup.wait()
+
+        try:
+            licenseName = get_license_name(self.licenseLookup(licenseID))
+
+            with self.lock:
+                self.licenseMappings[licenseID] = licenseName
+        finally:
+            with self.lock:
+                del self.pendingLookups[licenseID]
+            pendingLookup.set()
+
+        return licenseName
+
+    #---------------------------------------#
+    def resolve_many(self, licenseIDs):
+        # Look up each unique unknown ID once
+        uniqueLicenseIDs = set(licenseIDs)
+
+        with self.lock:
+            unknownLicenseIDs = [licenseID for licenseID in uniqueLicenseIDs if licenseID not in self.licenseMappings]
+            self.hits += len(uniqueLicenseIDs) - len(unknownLicenseIDs)
+
+        logger.debug("    Resolving %s unique license IDs, %s not yet known" %(len(uniqueLicenseIDs), len(unknownLicenseIDs)))
+
+        for licenseID in unknownLicenseIDs:
+            self.resolve(licenseID)
+
+        with self.lock:
+            return {licenseID : self.licenseMappings[licenseID] for licenseID in uniqueLicenseIDs}
+
+    #---------------------------------------#
+    def log_statistics(self):
+        logger.info("License lookups:  %s hits  %s misses" %(self.hits, self.misses))
+
+    #---------------------------------------#
+    def save(self):
+        license_cache.save_license_mappings(self.licenseCache, self.licenseMappings)
+
+    #---------------------------------------#
+    def close(self):
+        self.save()
+        self.licenseCache.close()
+
+#------------------------------------------------------------------#
+def open_license_resolver(baseURL, licenseLookup):
+    # Outside of a batch run every report has its own resolver
+    if sharedResolvers is None:
+        return LicenseResolver(baseURL, licenseLookup)
+
+    licenseResolver = sharedResolvers.get(baseURL)
+    if licenseResolver is None:
+        licenseResolver = LicenseResolver(baseURL, licenseLookup)
+        sharedResolvers[baseURL] = licenseResolver
+    else:
+        # Lookups are made with the server details of the current report
+        licenseResolver.licenseLookup = licenseLookup
+
+    return licenseResolver
+
+#------------------------------------------------------------------#
+def release_license_resolver(licenseResolver):
+    licenseResolver.log_statistics()
+
+    if sharedResolvers is None:
+        licenseResolver.close()
+    else:
+        licenseResolver.save()
+
+#------------------------------------------------------------------#
+def enable_shared_resolvers():
+    global sharedResolvers
+
+    if sharedResolvers is None:
+        sharedResolvers = {}
+
+#------------------------------------------------------------------#
+def close_shared_resolvers():
+    global sharedResolvers
+
+    if sharedResolvers is not None:
+        for licenseResolver in sharedResolvers.values():
+            licenseResolver.close()
+        sharedResolvers = None
+
+#------------------------------------------------------------------#
+def get_license_name(licenseDetails):
+    # Prefer the SPDX identifier and fall back to the Code Insight short name
+    spdxIdentifier = licenseDetails["spdxIdentifier"]
+    if spdxIdentifier != "" and spdxIdentifier != "N/A":
+        return spdxIdentifier
+    else:
+        return licenseDetails["shortName"]
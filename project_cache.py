@@ -0,0 +1,44 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : project_cache.py
+'''
+import logging
+
+import report_cache
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+def open_application_details_cache(baseURL):
+    if not report_settings.applicationDetailsCacheTimeToLive:
+        return None
+
+    namespace = report_cache.get_server_namespace("applicationDetails", baseURL)
+    return report_cache.ReportCache(report_settings.cacheFile, namespace, report_settings.applicationDetailsCacheTimeToLive)
+
+#------------------------------------------------------------------#
+def open_project_hierarchy_cache(baseURL):
+    if not report_settings.projectHierarchyCacheTimeToLive:
+        return None
+
+    namespace = report_cache.get_server_namespace("projectHierarchy", baseURL)
+    return report_cache.ReportCache(report_settings.cacheFile, namespace, report_settings.projectHierarchyCacheTimeToLive)
+
+#------------------------------------------------------------------#
+def get_child_hierarchies(projectHierarchy):
+    # The hierarchy of a project holds the complete hierarchy of each of its child projects
+    childHierarchies = {}
+
+    pendingProjects = [projectHierarchy]
+    while pendingProjects:
+        project = pendingProjects.pop()
+        childHierarchies[str(project["id"])] = project
+        pendingProjects += project.get("childProject", [])
+
+    return childHierarchies
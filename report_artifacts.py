@@ -8,12 +8,28 @@ Created On : Wed Jun 21 2023
 File : report_artifacts.py
 '''
 import logging
+import multiprocessing
+import queue
+import threading
 
+import report_settings
+import report_metrics
+import report_profiler
 import report_artifacts_html
+import report_artifacts_csv
+import report_artifacts_jsonl
+import report_artifacts_xlsx
 
 
 logger = logging.getLogger(__name__)
 
+# Writers for the machine readable report artifacts by format
+reportWriters = {
+    "csv" : report_artifacts_csv.CSVReportWriter,
+    "jsonl" : report_artifacts_jsonl.JSONLReportWriter,
+    "xlsx" : report_artifacts_xlsx.XLSXReportWriter,
+}
+
 #--------------------------------------------------------------------------------#
 def create_report_artifacts(reportData):
     logger.info("Entering create_report_artifacts")
@@ -21,10 +37,158 @@ def create_report_artifacts(reportData):
     # Dict to hold the complete list of reports
     reports = {}
 
-    htmlFile = report_artifacts_html.generate_html_report(reportData)
-    reports["viewable"] = htmlFile
-    reports["allFormats"] = [htmlFile]
+    # The audit history can only be consumed once so every item is handed to the other
+    # writers as the html report reads it
+    writerClasses = [reportWriters[exportFormat] for exportFormat in report_settings.exportFormats]
+
+    writers = None
+    if writerClasses and report_settings.artifactWorkerProcess and "fork" in multiprocessing.get_all_start_methods():
+        # Only the forking thread is copied to the worker so any other thread could leave a lock
+        # held within the worker.  The audit history is not collected until the html report reads
+        # it so there are no collection threads yet and the stack sampler of a profiled report
+        # is stopped until the worker has started
+        with report_profiler.paused_sampling():
+            if threading.active_count() == 1:
+                writers = [ProcessReportWriter(writerClasses, reportData)]
+            else:
+                logger.warning("    %s threads running.  Writing the report artifacts within the report process" %threading.active_count())
+
+    if writers is None:
+        writers = [writerClass(reportData) for writerClass in writerClasses]
+
+    try:
+        reportData["auditHistory"] = write_audit_history(reportData["auditHistory"], writers)
+
+        # The audit history is collected while the html report is written so this phase
+        # includes the collection time not overlapped by the history requests
+        with report_metrics.metrics.phase("htmlReport"):
+            htmlFile = report_artifacts_html.generate_html_report(reportData)
+        reports["viewable"] = htmlFile
+        reports["allFormats"] = [htmlFile]
+
+        with report_metrics.metrics.phase("exportArtifacts"):
+            for writer in writers:
+                reportFiles = writer.close()
+                reports["allFormats"] += reportFiles if isinstance(reportFiles, list) else [reportFiles]
+    except:
+        for writer in writers:
+            if isinstance(writer, ProcessReportWriter):
+                writer.terminate()
+        raise
 
     logger.info("Exiting create_report_artifacts")
     
-    return reports 
\ No newline at end of file
+    return reports 
+
+#--------------------------------------------------------------------------------#
+def write_audit_history(auditHistory, writers):
+    for inventoryID, auditItem in auditHistory:
+        for writer in writers:
+            writer.write_item(auditItem)
+        yield inventoryID, auditItem
+
+#--------------------------------------------------------------------------------#
+class ProcessReportWriter(object):
+    '''
+    Runs report writers within a forked worker process.  The audit items are sent to the
+    worker in batches through a bounded queue so the worker never falls far behind and the
+    memory used does not depend on the size of the report.  close returns the files written.
+    '''
+
+    def __init__(self, writerClasses, reportData):
+        logger.info("    Starting report artifact worker process")
+
+        # The worker is forked so it also inherits open files and connections, such as the SQLite
+        # connection of the license resolvers shared by a batch run.  It never uses them and ends
+        # without closing them so they are left untouched for the report process
+        context = multiprocessing.get_context("fork")
+        self.itemQueue = context.Queue(maxsize=max(1, report_settings.artifactQueueSize))
+        self.resultQueue = context.Queue()
+        self.pendingItems = []
+
+        writerDetails = {}
+        writerDetails["reportName"] = reportData["reportName"]
+        writerDetails["reportFileNameBase"] = reportData["reportFileNameBase"]
+
+        self.process = context.Process(target=run_report_writers, args=(writerClasses, writerDetails, self.itemQueue, self.resultQueue), name="ReportArtifactWriter", daemon=True)
+        self.process.start()
+
+    #---------------------------------------#
+    def write_item(self, auditItem):
+        self.pendingItems.append(auditItem)
+        if len(self.pendingItems) >= report_settings.artifactBatchSize:
+            self.send(self.pendingItems)
+            self.pendingItems = []
+
+    #---------------------------------------#
+    def send(self, auditItems):
+        # Do not wait forever on a full queue if the worker has gone away
+        while True:
+            try:
+                self.itemQueue.put(auditItems, timeout=1)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise RuntimeError("Report artifact worker process exited with code %s" %self.process.exitcode)
+
+    #---------------------------------------#
+    def close(self):
+        if self.pendingItems:
+            self.send(self.pendingItems)
+            self.pendingItems = []
+        self.send(None)
+
+        while True:
+            try:
+                succeeded, result = self.resultQueue.get(timeout=1)
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError("Report artifact worker process exited with code %s" %self.process.exitcode)
+
+        self.process.join()
+        logger.info("    Report artifact worker process complete")
+
+        # Stop the queue feeder thread so a later report of a batch run can fork its own worker
+        self.itemQueue.close()
+        self.itemQueue.join_thread()
+
+        if not succeeded:
+            raise RuntimeError("Unable to create the report artifacts: %s" %result)
+
+        return result
+
+    #---------------------------------------#
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+        # Items still waiting for the worker are discarded
+        self.itemQueue.cancel_join_thread()
+        self.itemQueue.close()
+
+#--------------------------------------------------------------------------------#
+def run_report_writers(writerClasses, reportData, itemQueue, resultQueue):
+    # Entry point of the worker process
+    allItemsReceived = False
+    try:
+        writers = [writerClass(reportData) for writerClass in writerClasses]
+
+        while True:
+            auditItems = itemQueue.get()
+            if auditItems is None:
+                allItemsReceived = True
+                break
+            for auditItem in auditItems:
+                for writer in writers:
+                    writer.write_item(auditItem)
+
+        resultQueue.put((True, [writer.close() for writer in writers]))
+    except Exception as error:
+        logger.exception("Unable to create the report artifacts")
+        resultQueue.put((False, str(error)))
+
+        # Keep reading until the end so the report process is never blocked on a full queue
+        while not allItemsReceived:
+            allItemsReceived = itemQueue.get() is None
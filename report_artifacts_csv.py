@@ -0,0 +1,47 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_artifacts_csv.py
+'''
+import logging
+import csv
+
+import audit_events
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class CSVReportWriter(object):
+    '''
+    Writes a row for each audit event to a csv file as the items are collected.
+    '''
+
+    def __init__(self, reportData):
+        logger.info("    Entering CSVReportWriter")
+        self.reportFile = reportData["reportFileNameBase"] + ".csv"
+        self.rowCount = 0
+
+        try:
+            self.file_ptr = open(self.reportFile, "w", newline="", encoding="utf-8")
+        except:
+            logger.error("Failed to open csv file %s:" %self.reportFile)
+            raise
+
+        self.csvWriter = csv.writer(self.file_ptr)
+        self.csvWriter.writerow(audit_events.exportColumns)
+
+    #---------------------------------------#
+    def write_item(self, auditItem):
+        for exportRow in audit_events.get_export_rows(auditItem):
+            self.csvWriter.writerow(exportRow)
+            self.rowCount += 1
+
+    #---------------------------------------#
+    def close(self):
+        self.file_ptr.close()
+        logger.info("    %s rows written to %s" %(self.rowCount, self.reportFile))
+        return self.reportFile
@@ -10,11 +10,16 @@ File : report_artifacts_html.py
 import logging
 import os
 import base64
+import json
 
 import _version
+import report_settings
+import report_metrics
 
 logger = logging.getLogger(__name__)
 
+htmlWriteBufferSize = 1024 * 1024  # Rows are written as they are collected so buffer the writes to disk
+
 #------------------------------------------------------------------#
 def generate_html_report(reportData):
     logger.info("    Entering generate_html_report")
@@ -22,8 +27,9 @@ def generate_html_report(reportData):
     reportFileNameBase = reportData["reportFileNameBase"]
     reportTimeStamp =  reportData["reportTimeStamp"]
     projectList = reportData["projectList"] 
+    auditFields = reportData["auditFields"]
 
-    auditHistory = reportData["auditHistory"]
+    auditHistory = reportData["auditHistory"]  # Iterable of (inventoryID, AuditItem) collected as it is consumed
 
     scriptDirectory = os.path.dirname(os.path.realpath(__file__))
     cssFile =  os.path.join(scriptDirectory, "report_branding/css/revenera_common.css")
@@ -41,7 +47,7 @@ def generate_html_report(reportData):
     # Create a simple HTML file to display
     #---------------------------------------------------------------------------------------------------
     try:
-        html_ptr = open(htmlFile,"w")
+        html_ptr = open(htmlFile, "w", buffering=htmlWriteBufferSize)
     except:
         logger.error("Failed to open htmlfile %s:" %htmlFile)
         raise
@@ -100,6 +106,14 @@ def generate_html_report(reportData):
     #---------------------------------------------------------------------------------------------------
     html_ptr.write("<!-- BEGIN BODY -->\n")  
 
+    # With more than one audited field each field has its own tab over the same table
+    showFieldColumn = len(auditFields) > 1
+    if showFieldColumn:
+        html_ptr.write("<ul class='nav nav-tabs' id='auditFieldTabs'>\n")
+        html_ptr.write("    <li class='nav-item'><a class='nav-link active' href='#' data-field=''>All Fields</a></li>\n")
+        for auditField in auditFields:
+            html_ptr.write("    <li class='nav-item'><a class='nav-link' href='#' data-field='%s'>%s</a></li>\n" %(auditField, auditField))
+        html_ptr.write("</ul>\n")
 
     html_ptr.write("<table id='auditData' class='table table-hover table-sm row-border' style='width:90%'>\n")
     html_ptr.write("    <thead>\n")
@@ -109,6 +123,8 @@ def generate_html_report(reportData):
     html_ptr.write("            <th style='width: 20%' class='text-center'>INVENTORY ITEM</th>\n")
     html_ptr.write("            <th style='width: 10%' class='text-center'>DATE</th>\n")
     html_ptr.write("            <th style='width: 15%' class='text-center'>USER</th>\n")
+    if showFieldColumn:
+        html_ptr.write("            <th style='width: 10%' class='text-center'>FIELD</th>\n")
     html_ptr.write("            <th style='width: 15%' class='text-center'>ORIGINAL VALUE</th>\n")   
     html_ptr.write("            <th style='width: 15%' class='text-center'>NEW VALUE</th>\n") 
     html_ptr.write("        </tr>\n")
@@ -116,28 +132,15 @@ def generate_html_report(reportData):
 
     html_ptr.write("    <tbody>\n")  
 
-    for inventoryItemID in auditHistory:
-        inventoryName =  auditHistory[inventoryItemID]["inventoryItemName"]
-        inventoryItemLink =  auditHistory[inventoryItemID]["inventoryItemLink"]
-        projectName = auditHistory[inventoryItemID]["project"]
-        projectLink = auditHistory[inventoryItemID]["projectLink"]
-        
-        for eventID in auditHistory[inventoryItemID]["events"]:
-            html_ptr.write("<tr>")
-            event = auditHistory[inventoryItemID]["events"][eventID]
-            
-            if len(projectList) > 1:
-                html_ptr.write("<td style=\"vertical-align:middle\"><a href=\"%s\" target=\"_blank\">%s</a></td>\n" %(projectLink, projectName))
-
-            html_ptr.write("<td style=\"vertical-align:middle\"><a href=\"%s\" target=\"_blank\">%s</a></td>\n" %(inventoryItemLink, inventoryName))
-            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event["date"])
-            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event["user"])
-            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event["oldValue"])
-            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event["newValue"])
-            html_ptr.write("</tr>")
-
-    html_ptr.write("    </tbody>\n")
-    html_ptr.write("</table>\n")  
+    if report_settings.htmlTableMode == "json":
+        # The rows are rendered on demand by DataTables from data embedded after the table
+        html_ptr.write("    </tbody>\n")
+        html_ptr.write("</table>\n")  
+        write_audit_rows_as_json(html_ptr, auditHistory, projectList, showFieldColumn)
+    else:
+        write_audit_rows_as_html(html_ptr, auditHistory, projectList, showFieldColumn)
+        html_ptr.write("    </tbody>\n")
+        html_ptr.write("</table>\n")  
 
     html_ptr.write("<!-- END BODY -->\n")  
 
@@ -149,6 +152,8 @@ def generate_html_report(reportData):
     html_ptr.write("  <div style='float:right'>Generated on %s</div>\n" %reportTimeStamp)
     html_ptr.write("<br>\n")
     html_ptr.write("  <div style='float:right'>Report Version: %s</div>\n" %_version.__version__)
+    if report_settings.showReportMetrics:
+        write_metrics_panel(html_ptr)
     html_ptr.write("</div>\n")
     html_ptr.write("<!-- END FOOTER -->\n")   
 
@@ -168,13 +173,57 @@ def generate_html_report(reportData):
 
     html_ptr.write("<script>\n")
 
-    html_ptr.write('''
+    if report_settings.htmlTableMode == "json":
+        html_ptr.write('''
+
+            function createLink(link, text) {
+                return "<a href=\\"" + link + "\\" target=\\"_blank\\">" + text + "</a>";
+            }
 
             $(document).ready(function (){
+                var columns = [];
+                if (showProjectColumn) {
+                    columns.push({ "data": 0, "render": function (data) { return createLink(auditProjects[data][1], auditProjects[data][0]); } });
+                }
+                columns.push({ "data": 1, "render": function (data, type, row) { return createLink(row[2], data); } });
+                columns.push({ "data": 3 }, { "data": 4 });
+                if (showFieldColumn) {
+                    columns.push({ "data": 7 });
+                }
+                columns.push({ "data": 5 }, { "data": 6 });
+
                 var table = $('#auditData').DataTable({
+                    "data": auditRows,
+                    "columns": columns,
+                    "deferRender": true,
                     "order": [[ 2, "asc" ]],
                     "lengthMenu": [ [25, 50, 100, -1], [25, 50, 100, "All"] ],
                 });
+        ''')
+    else:
+        html_ptr.write('''
+
+            $(document).ready(function (){
+                var table = $('#auditData').DataTable({
+                    "order": [[ 2, "asc" ]],
+                    "lengthMenu": [ [25, 50, 100, -1], [25, 50, 100, "All"] ],
+                });
+        ''')
+
+    if showFieldColumn:
+        # Each tab limits the table to the events of a single audited field
+        fieldColumnIndex = 4 if len(projectList) > 1 else 3
+        html_ptr.write('''
+                $('#auditFieldTabs a').on('click', function (e) {
+                    e.preventDefault();
+                    $('#auditFieldTabs a').removeClass('active');
+                    $(this).addClass('active');
+                    var field = $(this).data('field');
+                    table.column(%s).search(field ? '^' + $.fn.dataTable.util.escapeRegex(field) + '$' : '', true, false).draw();
+                });
+        ''' %fieldColumnIndex)
+
+    html_ptr.write('''
             });
         ''')
     
@@ -191,6 +240,95 @@ def generate_html_report(reportData):
 
 
 
+#------------------------------------------------------------------#
+def write_audit_rows_as_html(html_ptr, auditHistory, projectList, showFieldColumn):
+    logger.info("    Entering write_audit_rows_as_html")
+
+    for inventoryItemID, auditItem in auditHistory:
+        inventoryName =  auditItem.inventoryItemName
+        inventoryItemLink =  auditItem.inventoryItemLink
+        projectName = auditItem.projectName
+        projectLink = auditItem.projectLink
+        
+        for event in auditItem.events.values():
+            html_ptr.write("<tr>")
+            
+            if len(projectList) > 1:
+                html_ptr.write("<td style=\"vertical-align:middle\"><a href=\"%s\" target=\"_blank\">%s</a></td>\n" %(projectLink, projectName))
+
+            html_ptr.write("<td style=\"vertical-align:middle\"><a href=\"%s\" target=\"_blank\">%s</a></td>\n" %(inventoryItemLink, inventoryName))
+            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event.date)
+            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event.user)
+            if showFieldColumn:
+                html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event.field)
+            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event.oldValue)
+            html_ptr.write("<td style=\"vertical-align:middle\">%s</td>\n" %event.newValue)
+            html_ptr.write("</tr>")
+
+#------------------------------------------------------------------#
+def write_audit_rows_as_json(html_ptr, auditHistory, projectList, showFieldColumn):
+    logger.info("    Entering write_audit_rows_as_json")
+
+    # Each row is written as a compact array of
+    #   [project index, inventory item name, inventory item link, date, user, original value, new value, field]
+    # with the project names and links written once to a separate array after the rows
+    auditProjects = []
+    projectIndexes = {}
+    rowCount = 0
+
+    html_ptr.write("<script>\n")
+    html_ptr.write("var auditRows = [\n")
+
+    for inventoryItemID, auditItem in auditHistory:
+        projectKey = (auditItem.projectName, auditItem.projectLink)
+        if projectKey not in projectIndexes:
+            projectIndexes[projectKey] = len(auditProjects)
+            auditProjects.append(list(projectKey))
+
+        inventoryItemLink = auditItem.inventoryItemLink
+
+        for event in auditItem.events.values():
+            auditRow = [projectIndexes[projectKey], auditItem.inventoryItemName, inventoryItemLink, event.date, event.user, event.oldValue, event.newValue, event.field]
+
+            if rowCount:
+                html_ptr.write(",\n")
+            html_ptr.write(encode_json_for_script(auditRow))
+            rowCount += 1
+
+    html_ptr.write("\n];\n")
+    html_ptr.write("var auditProjects = %s;\n" %encode_json_for_script(auditProjects))
+    html_ptr.write("var showProjectColumn = %s;\n" %encode_json_for_script(len(projectList) > 1))
+    html_ptr.write("var showFieldColumn = %s;\n" %encode_json_for_script(showFieldColumn))
+    html_ptr.write("</script>\n")
+
+    logger.info("    %s audit rows written" %rowCount)
+
+#------------------------------------------------------------------#
+def write_metrics_panel(html_ptr):
+    # Timings of the data collection so far.  The archive and upload happen after the report is written
+    metricsSummary = report_metrics.metrics.get_summary()
+
+    html_ptr.write("<br>\n")
+    html_ptr.write("<details id='reportMetrics' style='clear:both'>\n")
+    html_ptr.write("  <summary>Report Metrics (%ss)</summary>\n" %metricsSummary["elapsedSeconds"])
+    html_ptr.write("  <table class='table table-sm' style='width:auto'>\n")
+    html_ptr.write("    <tr><th>PHASE</th><th class='text-right'>SECONDS</th><th class='text-right'>COUNT</th></tr>\n")
+    for phaseName, phaseDetails in metricsSummary["phases"].items():
+        html_ptr.write("    <tr><td>%s</td><td class='text-right'>%.3f</td><td class='text-right'>%s</td></tr>\n" %(phaseName, phaseDetails["seconds"], phaseDetails["count"]))
+    html_ptr.write("  </table>\n")
+    html_ptr.write("  <table class='table table-sm' style='width:auto'>\n")
+    html_ptr.write("    <tr><th>ENDPOINT</th><th class='text-right'>REQUESTS</th><th class='text-right'>ERRORS</th><th class='text-right'>BYTES</th><th class='text-right'>P50</th><th class='text-right'>P90</th><th class='text-right'>P99</th></tr>\n")
+    for endpoint, endpointSummary in metricsSummary["endpoints"].items():
+        latency = endpointSummary["latency"]
+        html_ptr.write("    <tr><td>%s</td><td class='text-right'>%s</td><td class='text-right'>%s</td><td class='text-right'>%s</td><td class='text-right'>%.3f</td><td class='text-right'>%.3f</td><td class='text-right'>%.3f</td></tr>\n" %(endpoint, endpointSummary["requests"], endpointSummary["errors"], endpointSummary["bytesReceived"], latency["p50"], latency["p90"], latency["p99"]))
+    html_ptr.write("  </table>\n")
+    html_ptr.write("</details>\n")
+
+#------------------------------------------------------------------#
+def encode_json_for_script(value):
+    # Make sure the data can not close the script block it is embedded within
+    return json.dumps(value, separators=(",", ":")).replace("</", "<\\/")
+
 ####################################################################
 def encodeImage(imageFile):
 
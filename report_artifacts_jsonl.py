@@ -0,0 +1,53 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_artifacts_jsonl.py
+'''
+import logging
+import json
+
+import audit_events
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class JSONLReportWriter(object):
+    '''
+    Writes a json object for each audit event on its own line (JSON Lines) as the items
+    are collected.  The keys are the csv column headings in camel case.
+    '''
+
+    def __init__(self, reportData):
+        logger.info("    Entering JSONLReportWriter")
+        self.reportFile = reportData["reportFileNameBase"] + ".jsonl"
+        self.rowCount = 0
+        self.keys = [get_json_key(exportColumn) for exportColumn in audit_events.exportColumns]
+
+        try:
+            self.file_ptr = open(self.reportFile, "w", encoding="utf-8")
+        except:
+            logger.error("Failed to open jsonl file %s:" %self.reportFile)
+            raise
+
+    #---------------------------------------#
+    def write_item(self, auditItem):
+        for exportRow in audit_events.get_export_rows(auditItem):
+            self.file_ptr.write(json.dumps(dict(zip(self.keys, exportRow)), separators=(",", ":")))
+            self.file_ptr.write("\n")
+            self.rowCount += 1
+
+    #---------------------------------------#
+    def close(self):
+        self.file_ptr.close()
+        logger.info("    %s rows written to %s" %(self.rowCount, self.reportFile))
+        return self.reportFile
+
+#------------------------------------------------------------------#
+def get_json_key(exportColumn):
+    # i.e. "Inventory Item Link" becomes inventoryItemLink
+    words = exportColumn.split(" ")
+    return words[0].lower() + "".join(word[0].upper() + word[1:] for word in words[1:])
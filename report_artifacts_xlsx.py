@@ -0,0 +1,85 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_artifacts_xlsx.py
+'''
+import logging
+
+import xlsxwriter
+
+import audit_events
+
+logger = logging.getLogger(__name__)
+
+# Column widths in the order of audit_events.exportColumns
+columnWidths = (30, 12, 40, 16, 50, 16, 20, 25, 30, 30, 30)
+maxWorksheetRows = 1048576  # Excel limit including the heading row
+
+#------------------------------------------------------------------#
+class XLSXReportWriter(object):
+    '''
+    Writes the audit events to an Excel workbook as the items are collected.  The workbook
+    uses constant_memory mode so each row is flushed to disk once the next row is started
+    and the memory used does not grow with the size of the audit.  Rows beyond the limit of
+    an Excel worksheet are written to further worksheets.
+    '''
+
+    def __init__(self, reportData):
+        logger.info("    Entering XLSXReportWriter")
+        self.reportFile = reportData["reportFileNameBase"] + ".xlsx"
+        self.totalRows = 0
+
+        self.workbook = xlsxwriter.Workbook(self.reportFile, {"constant_memory": True, "strings_to_urls": False})
+        self.workbook.set_properties({"title": reportData["reportName"]})
+        self.headingFormat = self.workbook.add_format({"bold": True, "font_color": "white", "bg_color": "#2C4E63", "border": 1})
+
+        self.worksheets = []
+        self.add_worksheet()
+
+    #---------------------------------------#
+    def add_worksheet(self):
+        # Audits larger than a worksheet continue on Audit History 2, 3, ...
+        if self.worksheets:
+            self.close_worksheet()
+            worksheetName = "Audit History %s" %(len(self.worksheets) + 1)
+            logger.info("    Worksheet row limit reached.  Continuing the audit history on %s" %worksheetName)
+        else:
+            worksheetName = "Audit History"
+
+        self.worksheet = self.workbook.add_worksheet(worksheetName)
+        self.worksheets.append(self.worksheet)
+        self.rowCount = 0
+        self.worksheet.freeze_panes(1, 0)
+
+        for columnIndex, columnWidth in enumerate(columnWidths):
+            self.worksheet.set_column(columnIndex, columnIndex, columnWidth)
+
+        # In constant_memory mode the rows must be written in order starting with the headings
+        self.worksheet.write_row(0, 0, audit_events.exportColumns, self.headingFormat)
+
+    #---------------------------------------#
+    def close_worksheet(self):
+        self.worksheet.autofilter(0, 0, self.rowCount, len(audit_events.exportColumns) - 1)
+
+    #---------------------------------------#
+    def write_item(self, auditItem):
+        for exportRow in audit_events.get_export_rows(auditItem):
+            if self.rowCount + 1 >= maxWorksheetRows:
+                self.add_worksheet()
+
+            self.rowCount += 1
+            if self.worksheet.write_row(self.rowCount, 0, exportRow) == -1:
+                logger.error("    Unable to write row %s of worksheet %s" %(self.rowCount, self.worksheet.get_name()))
+                continue
+            self.totalRows += 1
+
+    #---------------------------------------#
+    def close(self):
+        self.close_worksheet()
+        self.workbook.close()
+        logger.info("    %s rows written to %s worksheets of %s" %(self.totalRows, len(self.worksheets), self.reportFile))
+        return self.reportFile
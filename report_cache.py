@@ -0,0 +1,260 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_cache.py
+'''
+import logging
+import argparse
+import os
+import pathlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+# Stamp stored within the cache file.  Bump this value whenever the format of the
+# cached values changes so that stale entries from older report versions are discarded
+cacheVersion = "5"
+
+#------------------------------------------------------------------#
+class ReportCache(object):
+    '''
+    Small persistent key/value store backed by SQLite that can be shared across report runs.
+    Values are stored as json and expire once they are older than timeToLive seconds.
+    A timeToLive of None means the entries never expire.  Large values can be stored zlib
+    compressed and a namespace can be limited to maxSize bytes in which case the least
+    recently used entries are evicted.
+    '''
+
+    def __init__(self, cacheFile, namespace, timeToLive=None, compress=False, maxSize=None):
+        self.cacheFile = cacheFile
+        self.namespace = namespace
+        self.timeToLive = timeToLive
+        self.compress = compress
+        self.maxSize = maxSize
+        self.accessedKeys = {} # Last access of entries read since the previous write
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(cacheFile, timeout=30, check_same_thread=False)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+
+        # Discard everything if the cache was created by a different version of the report
+        row = self.connection.execute("SELECT value FROM metadata WHERE name = 'version'").fetchone()
+        if row is None or row[0] != cacheVersion:
+            logger.info("Resetting report cache %s (version %s -> %s)" %(cacheFile, row[0] if row else None, cacheVersion))
+            self.connection.execute("DROP TABLE IF EXISTS entries")
+            self.connection.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES ('version', ?)", (cacheVersion,))
+
+        self.connection.execute("CREATE TABLE IF NOT EXISTS entries (namespace TEXT, key TEXT, value BLOB, created REAL, accessed REAL, size INTEGER, PRIMARY KEY (namespace, key))")
+        self.connection.commit()
+
+    #---------------------------------------#
+    def is_expired(self, created):
+        if self.timeToLive is None:
+            return False
+        return time.time() - created > self.timeToLive
+
+    #---------------------------------------#
+    def get(self, key, default=None):
+        with self.lock:
+            row = self.connection.execute("SELECT value, created FROM entries WHERE namespace = ? AND key = ?", (self.namespace, str(key))).fetchone()
+
+            # Reads are not written back straight away so they do not hold a write lock
+            if row is not None and self.maxSize is not None:
+                self.accessedKeys[str(key)] = time.time()
+
+        if row is None or self.is_expired(row[1]):
+            return default
+
+        return decode_value(row[0])
+
+    #---------------------------------------#
+    def get_all(self):
+        with self.lock:
+            rows = self.connection.execute("SELECT key, value, created FROM entries WHERE namespace = ?", (self.namespace,)).fetchall()
+
+        return {key : decode_value(value) for key, value, created in rows if not self.is_expired(created)}
+
+    #---------------------------------------#
+    def set(self, key, value):
+        self.set_many({key : value})
+
+    #---------------------------------------#
+    def set_many(self, values):
+        created = time.time()
+
+        rows = []
+        for key, value in values.items():
+            encodedValue = encode_value(value, self.compress)
+            rows.append((self.namespace, str(key), encodedValue, created, created, len(encodedValue)))
+
+        with self.lock:
+            self.write_accessed_keys()
+            self.connection.executemany("INSERT OR REPLACE INTO entries (namespace, key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            if self.maxSize is not None:
+                self.evict_entries()
+            self.connection.commit()
+
+    #---------------------------------------#
+    def write_accessed_keys(self):
+        # Called with the lock held as part of a write
+        if self.accessedKeys:
+            self.connection.executemany("UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?", [(accessed, self.namespace, key) for key, accessed in self.accessedKeys.items()])
+            self.accessedKeys = {}
+
+    #---------------------------------------#
+    def evict_entries(self):
+        # Remove the least recently used entries once the namespace is larger than maxSize
+        totalSize = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+        if totalSize <= self.maxSize:
+            return
+
+        evictedKeys = []
+        for key, size in self.connection.execute("SELECT key, size FROM entries WHERE namespace = ? ORDER BY accessed", (self.namespace,)).fetchall():
+            if totalSize <= self.maxSize:
+                break
+            evictedKeys.append((self.namespace, key))
+            totalSize -= size
+
+        self.connection.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", evictedKeys)
+        logger.debug("    Evicted %s entries from %s to stay within %s bytes" %(len(evictedKeys), self.namespace, self.maxSize))
+
+    #---------------------------------------#
+    def delete(self, key):
+        with self.lock:
+            self.connection.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, str(key)))
+            self.connection.commit()
+
+    #---------------------------------------#
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+            self.connection.commit()
+
+    #---------------------------------------#
+    def close(self):
+        with self.lock:
+            self.write_accessed_keys()
+            self.connection.commit()
+            self.connection.close()
+
+#------------------------------------------------------------------#
+def get_server_namespace(namespace, baseURL):
+    # License, project and inventory IDs are specific to a Code Insight server so the entries
+    # holding them are kept separate per server
+    return namespace + "|" + baseURL
+
+#------------------------------------------------------------------#
+def encode_value(value, compress):
+    encodedValue = json.dumps(value)
+    if compress:
+        return zlib.compress(encodedValue.encode("utf-8"))
+    return encodedValue
+
+#------------------------------------------------------------------#
+def decode_value(value):
+    # Compressed values are stored as bytes and everything else as text
+    if isinstance(value, bytes):
+        value = zlib.decompress(value).decode("utf-8")
+    return json.loads(value)
+
+#------------------------------------------------------------------#
+def get_cache_statistics(cacheFile):
+    # Opened read only so looking at a cache never changes it, even one of another version
+    connection = sqlite3.connect(pathlib.Path(os.path.abspath(cacheFile)).as_uri() + "?mode=ro", uri=True, timeout=30)
+    try:
+        tableNames = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+
+        storedVersion = None
+        if "metadata" in tableNames:
+            row = connection.execute("SELECT value FROM metadata WHERE name = 'version'").fetchone()
+            storedVersion = row[0] if row else None
+
+        # Older versions of the cache do not record the size and last use of the entries
+        if "entries" not in tableNames:
+            namespaceStatistics = []
+        elif storedVersion == cacheVersion:
+            namespaceStatistics = connection.execute("SELECT namespace, COUNT(*), COALESCE(SUM(size), 0), MIN(created), MAX(accessed) FROM entries GROUP BY namespace ORDER BY namespace").fetchall()
+        else:
+            namespaceStatistics = connection.execute("SELECT namespace, COUNT(*), NULL, MIN(created), NULL FROM entries GROUP BY namespace ORDER BY namespace").fetchall()
+
+        return storedVersion, namespaceStatistics
+    finally:
+        connection.close()
+
+#------------------------------------------------------------------#
+def purge_entries(cacheFile, namespacePrefix=None, olderThan=None):
+    # Remove the entries of the namespaces starting with namespacePrefix (or all of them)
+    # optionally limited to the entries not used within the last olderThan seconds
+    conditions = []
+    parameters = []
+
+    if namespacePrefix:
+        conditions.append("substr(namespace, 1, ?) = ?")
+        parameters += [len(namespacePrefix), namespacePrefix]
+
+    if olderThan is not None:
+        conditions.append("accessed < ?")
+        parameters.append(time.time() - olderThan)
+
+    connection = sqlite3.connect(cacheFile, timeout=30)
+    try:
+        purgedEntries = connection.execute("DELETE FROM entries" + (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters).rowcount
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    return purgedEntries
+
+#------------------------------------------------------------------#
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or purge the report cache")
+    parser.add_argument("--cacheFile", default=report_settings.cacheFile, help="Report cache file")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("inspect", help="Show the entries and size of each namespace")
+    purgeParser = subparsers.add_parser("purge", help="Remove entries from the cache")
+    purgeParser.add_argument("--namespace", help="Only purge namespaces starting with this prefix (i.e. inventoryHistory)")
+    purgeParser.add_argument("--olderThanDays", type=float, help="Only purge entries not used within this number of days")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.cacheFile):
+        print("No report cache at %s" %args.cacheFile)
+        return
+
+    if args.command == "purge":
+        # Make sure the tables exist and match the current version.  A cache of another version
+        # is discarded as the next report run would do
+        ReportCache(args.cacheFile, "").close()
+
+        olderThan = args.olderThanDays * 24 * 60 * 60 if args.olderThanDays is not None else None
+        purgedEntries = purge_entries(args.cacheFile, args.namespace, olderThan)
+        print("Purged %s entries from %s" %(purgedEntries, args.cacheFile))
+    else:
+        storedVersion, namespaceStatistics = get_cache_statistics(args.cacheFile)
+
+        print("Report cache: %s  (%s bytes on disk)" %(args.cacheFile, os.path.getsize(args.cacheFile)))
+        print("Cache version: %s" %storedVersion)
+        if storedVersion != cacheVersion:
+            print("    The current report uses version %s so these entries will be discarded by the next report run" %cacheVersion)
+
+        print("%-80s %10s %14s  %-19s  %-19s" %("NAMESPACE", "ENTRIES", "BYTES", "OLDEST", "LAST USED"))
+        for namespace, entries, size, created, accessed in namespaceStatistics:
+            print("%-80s %10s %14s  %-19s  %-19s" %(namespace, entries, size if size is not None else "", format_timestamp(created), format_timestamp(accessed)))
+
+#------------------------------------------------------------------#
+def format_timestamp(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp else ""
+
+#------------------------------------------------------------------#
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_checkpoint.py
+'''
+import logging
+import time
+
+import report_cache
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+def get_checkpoint_key(baseURL, projectID, reportID, reportOptions, auditFields, restrictedLicensePolicy):
+    # A run can only be resumed by a later run creating the same report with the same options
+    return "|".join(["checkpoint", baseURL, str(projectID), str(reportID), "+".join(auditFields), str(reportOptions["includeChildProjects"]), str(reportOptions["restrictedLicensesOnly"]), restrictedLicensePolicy.fingerprint])
+
+#------------------------------------------------------------------#
+class ReportCheckpoint(object):
+    '''
+    Journal of the inventory items already collected by a report run.  Completed items are
+    written to the report cache every checkpointInterval items (or checkpointSeconds) so a
+    run that dies part way through can be resumed without collecting those items again.
+    Each item is stored with the change token of the inventory item when it was collected and
+    is only reused while the item is unchanged.
+    '''
+
+    def __init__(self, checkpointKey):
+        self.checkpointCache = report_cache.ReportCache(report_settings.cacheFile, checkpointKey, report_settings.checkpointTimeToLive)
+        self.completedItems = self.checkpointCache.get_all()
+        self.pendingItems = {}
+        self.lastFlush = time.monotonic()
+
+        if self.completedItems:
+            logger.info("Resuming from checkpoint with %s inventory items already collected" %len(self.completedItems))
+            print("    Resuming previous run with %s inventory items already collected" %len(self.completedItems))
+
+    #---------------------------------------#
+    def get_item(self, projectID, inventoryID, changeToken):
+        itemState = self.completedItems.get(get_item_key(projectID, inventoryID))
+        if itemState is None:
+            return None
+
+        # Without a change token there is no way to tell if the item was edited since
+        if changeToken is None or itemState.get("changeToken") != changeToken:
+            logger.debug("    Inventory item %s changed since it was checkpointed" %inventoryID)
+            return None
+
+        return itemState
+
+    #---------------------------------------#
+    def add_item(self, projectID, inventoryID, itemState):
+        self.pendingItems[get_item_key(projectID, inventoryID)] = itemState
+
+        if len(self.pendingItems) >= report_settings.checkpointInterval or time.monotonic() - self.lastFlush >= report_settings.checkpointSeconds:
+            self.flush()
+
+    #---------------------------------------#
+    def flush(self):
+        if self.pendingItems:
+            logger.debug("    Checkpointing %s inventory items" %len(self.pendingItems))
+            self.checkpointCache.set_many(self.pendingItems)
+            self.pendingItems = {}
+        self.lastFlush = time.monotonic()
+
+    #---------------------------------------#
+    def complete(self):
+        # The report data was collected in full so there is nothing left to resume
+        logger.info("Report data collection complete.  Removing checkpoint")
+        self.pendingItems = {}
+        self.checkpointCache.clear()
+
+    #---------------------------------------#
+    def close(self):
+        self.flush()
+        self.checkpointCache.close()
+
+#------------------------------------------------------------------#
+def get_item_key(projectID, inventoryID):
+    return "%s|%s" %(projectID, inventoryID)
@@ -8,7 +8,20 @@ Created On : Wed Jun 21 2023
 File : report_data.py
 '''
 import logging
-import restricted_licenses
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import audit_events
+import license_policy
+import report_settings
+import license_resolver
+import report_metrics
+import project_cache
+import history_cache
+import incremental_state
+import report_checkpoint
 
 import CodeInsight_RESTAPIs.project.get_child_projects
 import CodeInsight_RESTAPIs.project.get_inventory_summary
@@ -20,24 +33,34 @@ import CodeInsight_RESTAPIs.license.license_lookup
 logger = logging.getLogger(__name__)
 logging.getLogger("urllib3").setLevel(logging.WARNING)  # Disable logging for requests module
 
+licenseAuditField = "License"  # Audited field whose values are license IDs
+
+# Global cap on the REST calls in flight across the project and inventory history pools
+requestLimiter = threading.BoundedSemaphore(max(1, report_settings.maxConcurrentRequests))
+
+sharedProjectCollection = None  # Project data shared by every report generated by a batch run
 
 
 #-------------------------------------------------------------------#
-def gather_data_for_report(baseURL, projectID, authToken, reportName, reportOptions, auditField):
+def gather_data_for_report(baseURL, projectID, authToken, reportName, reportOptions, auditFields, reportID=None):
     logger.info("Entering gather_data_for_report")
 
     # Parse report options
     includeChildProjects = reportOptions["includeChildProjects"]  # True/False
-    restrictedLicensesOnly = reportOptions["restrictedLicensesOnly"]  # True/False
 
     projectList = [] # List to hold parent/child details for report
-    projectData = {} # Create a dictionary containing the project level summary data using projectID as keys
-    auditHistory = {} # Hold the event data for a specific inventory Item
-    applicationDetails = {} # Dictionary to allow a project to be mapped to an application name/version
-    licenseMappings = {} # Allow to make a license name to a given license ID
 
     # Get the list of parent/child projects start at the base project
-    projectHierarchy = CodeInsight_RESTAPIs.project.get_child_projects.get_child_projects_recursively(baseURL, projectID, authToken)
+    try:
+        with report_metrics.metrics.phase("hierarchy"):
+            projectHierarchy = get_project_hierarchy(baseURL, projectID, authToken)
+    except Exception as error:
+        # Without the hierarchy there is nothing to report on so only the error report is created
+        logger.exception("Unable to collect the project hierarchy for project %s" %projectID)
+        reportData = {}
+        reportData["reportName"] = reportName
+        reportData["errorMsg"] = ["Unable to collect the project hierarchy for project <b>%s</b>: %s" %(projectID, error)]
+        return reportData
 
     # Create a list of project data sorted by the project name at each level for report display  
     # Add details for the parent node
@@ -54,118 +77,694 @@ def gather_data_for_report(baseURL, projectID, authToken, reportName, reportOpti
     else:
         logger.debug("Child hierarchy disabled")
 
-    #  Gather the details for each project and summerize the data
-    for project in projectList:
+    # Build up the data to return for the report.  The audit history is not materialized here
+    # but is collected item by item as the report artifacts consume it
+    reportData = {}
+    reportData["reportName"] = reportName
+    reportData["projectList"] = projectList
+    reportData["projectHierarchy"] = projectHierarchy
+    reportData["projectName"] = projectHierarchy["name"]
+    reportData["auditFields"] = auditFields
+    reportData["collectionErrors"] = [] # Projects or items that could not be collected
 
-        projectID = project["projectID"]
-        projectName = project["projectName"]
-        projectLink = project["projectLink"]
+    # Rules deciding which license changes are reported when limited to restricted licenses
+    restrictedLicensePolicy = license_policy.load_restricted_license_policy()
+
+    # Allow an interrupted run for the same report and options to pick up where it stopped
+    if report_settings.checkpointEnabled and reportID is not None:
+        checkpointKey = report_checkpoint.get_checkpoint_key(baseURL, projectID, reportID, reportOptions, auditFields, restrictedLicensePolicy)
+    else:
+        checkpointKey = None
+
+    reportData["auditHistory"] = generate_audit_history(baseURL, projectList, authToken, reportOptions, auditFields, restrictedLicensePolicy, reportData["collectionErrors"], checkpointKey)
+
+    return reportData
+
+#-------------------------------------------------------------------#
+def generate_audit_history(baseURL, projectList, authToken, reportOptions, auditFields, restrictedLicensePolicy, collectionErrors, checkpointKey):
+    logger.info("Entering generate_audit_history")
 
-        applicationDetails[projectName] = determine_application_details(baseURL, projectName, projectID, authToken)
-        applicationNameVersion = applicationDetails[projectName]["applicationNameVersion"]
-        
-        # Add the applicationNameVersion to the project hierarchy
-        project["applicationNameVersion"] = applicationNameVersion
-        
-        projectInventorySummary = CodeInsight_RESTAPIs.project.get_inventory_summary.get_project_inventory_without_vulns_summary(baseURL, projectID, authToken)
+    # Yields a (inventoryID, AuditItem) tuple for each inventory item with at least one
+    # reportable event so only a single item needs to be held in memory at any one time.
+    # Anything that can not be collected is skipped and recorded within collectionErrors
 
-        if not projectInventorySummary:
-            logger.warning("    Project contains no inventory items")
-            print("Project contains no inventory items.")
+    restrictedLicensesOnly = reportOptions["restrictedLicensesOnly"]  # True/False
+
+    # Every audited field is collected from the same inventory history
+    auditFieldMatcher = AuditFieldMatcher(auditFields)
+
+    #  Gather the details for each project and summerize the data.  The projects are processed
+    #  concurrently and their inventory history requests are made on a shared pool
+    projectExecutor = ThreadPoolExecutor(max_workers=max(1, report_settings.maxProjectWorkers))
+    historyExecutor = ThreadPoolExecutor(max_workers=max(1, report_settings.maxInventoryHistoryWorkers))
+
+    # Allow to make a license name to a given license ID.  Mappings from previous runs are reused
+    def license_lookup(licenseID):
+        return call_codeinsight_api(CodeInsight_RESTAPIs.license.license_lookup.get_license_details, baseURL, licenseID, authToken)
+
+    licenseResolver = license_resolver.open_license_resolver(baseURL, license_lookup)
+    restrictedLicensePolicy.compile(licenseResolver.licenseMappings)
+
+    # The audit events of an inventory item depend on the fields and options of the report
+    collectionKey = "|".join(["+".join(auditFields), str(restrictedLicensesOnly), restrictedLicensePolicy.fingerprint])
+
+    # Items already collected by an interrupted run of this report
+    checkpoint = report_checkpoint.ReportCheckpoint(checkpointKey) if checkpointKey is not None else None
+
+    # Application details and inventory histories collected by earlier report runs
+    applicationDetailsCache = project_cache.open_application_details_cache(baseURL)
+    inventoryHistoryCache = history_cache.open_history_cache(baseURL)
+
+    # Only keep track of previous results if incremental mode has been enabled
+    if report_settings.incrementalAudit:
+        logger.info("Incremental audit enabled")
 
-        # Create empty dictionary for project level data for this project
-        projectData[projectName] = {}
+    # The license IDs of each history are resolved on the history workers so a license that is not
+    # yet known does not hold up the collector
+    historyLicenseResolution = (licenseResolver, auditFieldMatcher, restrictedLicensesOnly, restrictedLicensePolicy)
 
-        currentItem=0
+    def submit_history_request(inventoryItemDetails):
+        # Skip the history request if the item is unchanged since the previous report
+        if inventoryItemDetails["historyRequired"]:
+            return historyExecutor.submit(collect_inventory_history, baseURL, inventoryItemDetails["inventoryItem"]["id"], authToken, inventoryItemDetails["project"], inventoryItemDetails["historyToken"], inventoryHistoryCache, historyLicenseResolution)
+        return None
 
-        for inventoryItem in projectInventorySummary:
+    projectFutures = {} # Projects submitted but not yet processed
 
-            # This is not a component for move to the next item
-            if inventoryItem["type"] != "Component":
+    def submit_project_request(project):
+        if report_settings.incrementalAudit:
+            stateKey = incremental_state.get_state_key(baseURL, project["projectID"], reportOptions, auditFields, restrictedLicensePolicy)
+        else:
+            stateKey = None
+        projectFutures[project["projectID"]] = projectExecutor.submit(collect_project_details, baseURL, project, authToken, stateKey, checkpoint, auditFieldMatcher, collectionKey, applicationDetailsCache)
+        return projectFutures[project["projectID"]]
+
+    try:
+        # A project may appear more than once within the hierarchy but is only collected once.  Only
+        # a pool's worth of projects are collected ahead of the project being processed so the
+        # memory used does not depend on the number of projects
+        uniqueProjects = []
+        uniqueProjectIDs = set()
+        for project in projectList:
+            if project["projectID"] not in uniqueProjectIDs:
+                uniqueProjectIDs.add(project["projectID"])
+                uniqueProjects.append(project)
+        projectDetailsFutures = prefetch(uniqueProjects, submit_project_request, max(1, report_settings.maxProjectWorkers))
+
+        # Walk the inventory items in the original project order so the report content is unchanged
+        # while keeping a bounded number of history requests ahead of the item being processed
+        inventoryItems = iterate_inventory_items(projectList, projectDetailsFutures, projectFutures, collectionErrors)
+        historyLookAhead = max(1, report_settings.maxInventoryHistoryWorkers * report_settings.historyLookAheadFactor)
+
+        projectState = {}
+        prefilteredItems = 0 # History requests avoided based on the inventory summary
+
+        for inventoryItemDetails, inventoryHistoryFuture in prefetch(inventoryItems, submit_history_request, historyLookAhead):
+
+            project = inventoryItemDetails["project"]
+            projectDetails = inventoryItemDetails["projectDetails"]
+
+            projectID = project["projectID"]
+            projectName = project["projectName"]
+            projectLink = project["projectLink"]
+
+            # The last entry for a project is a marker allowing the project level state to be saved
+            if inventoryItemDetails["inventoryItem"] is None:
+                if projectDetails["stateKey"] is not None:
+                    incremental_state.save_project_state(projectDetails["stateKey"], projectState)
+                projectState = {}
                 continue
-           
-            currentItem +=1
-            reportableEvent = False # only make true if there is an event we want to track
-            inventoryAuditHistory = {}
+
+            inventoryItem = inventoryItemDetails["inventoryItem"]
+            previousEvents = inventoryItemDetails["previousState"]["events"] if inventoryItemDetails["previousState"] else {}
+            unresolvedEvents = [] # License events holding license IDs rather than license names
 
             inventoryID = inventoryItem["id"]
             inventoryItemName = inventoryItem["name"]
 
-            logger.debug("Processing inventory items %s of %s" %(currentItem, len(projectInventorySummary)))
+            logger.debug("Processing inventory items %s of %s" %(inventoryItemDetails["currentItem"], projectDetails["inventoryItemCount"]))
             logger.debug("    Project:  %s   Inventory Name: %s  Inventory ID: %s" %(projectName, inventoryItemName, inventoryID))
 
-            # Get the inventory history for this item
-            inventoryHistory = CodeInsight_RESTAPIs.inventory.get_inventory_history.get_inventory_history_details(baseURL, inventoryID, authToken)
-            for eventID in inventoryHistory:
-                inventoryChangeEvent = inventoryHistory[eventID]
-        
-                for action in inventoryChangeEvent:
-                    if auditField in action["field"]:
-
-                        if restrictedLicensesOnly and action["oldValue"] in restricted_licenses.restrictedLicenses or not restrictedLicensesOnly:
-
-                            # since this is an event we care about we need to capture the details for this inventory item
-                            reportableEvent = True
-                            inventoryAuditHistory[eventID] = {}
-                            inventoryAuditHistory[eventID]["date"] = action["date"]
-                            inventoryAuditHistory[eventID]["user"] = action["user"]
-                            inventoryAuditHistory[eventID]["userEmail"] = action["userEmail"]
-                            
-                            # Specific for license events we need to map the license IDs to license names
-                            oldLicenseID  = action["oldValue"]
-                            newLicenseID = action["newValue"]
-
-                            # Is there a mapping for the old license ID?
-                            if oldLicenseID in licenseMappings:
-                                licenseName = licenseMappings[oldLicenseID]
-                            else:
-                                licenseDetails = CodeInsight_RESTAPIs.license.license_lookup.get_license_details(baseURL, oldLicenseID, authToken) 
-
-                                spdxIdentifier = licenseDetails["spdxIdentifier"]
-                                if spdxIdentifier != "" and spdxIdentifier != "N/A":
-                                    licenseName = spdxIdentifier
-                                else:
-                                    licenseName = licenseDetails["shortName"]
-                                    licenseMappings[oldLicenseID] = licenseName
-                            
-                            inventoryAuditHistory[eventID]["oldValue"] = licenseName       
-
-                            # Is there a mapping for the new license ID?
-                            if newLicenseID in licenseMappings:
-                                licenseName= licenseMappings[newLicenseID]
-                            else:
-                                licenseDetails = CodeInsight_RESTAPIs.license.license_lookup.get_license_details(baseURL, newLicenseID, authToken) 
-
-                                spdxIdentifier = licenseDetails["spdxIdentifier"]
-                                if spdxIdentifier != "" and spdxIdentifier != "N/A":
-                                    licenseName = spdxIdentifier
-                                else:
-                                    licenseName = licenseDetails["shortName"]   
-                                    licenseMappings[newLicenseID] = licenseName 
-                            
-                            inventoryAuditHistory[eventID]["newValue"] = licenseName    
-
-            # Was there at least one licnse change for this inventory item>
-            if reportableEvent:
-
-                auditHistory[inventoryID] = {}
-                auditHistory[inventoryID]["inventoryItemName"] = inventoryItemName
-                auditHistory[inventoryID]["inventoryItemLink"] = baseURL + '''/codeinsight/FNCI#myprojectdetails/?id=''' + str(projectID) + '''&tab=projectInventory&pinv=''' + str(inventoryID)
-
-                auditHistory[inventoryID]["project"] = projectName
-                auditHistory[inventoryID]["projectLink"] = projectLink
-                auditHistory[inventoryID]["events"] = inventoryAuditHistory
-
-    # Build up the data to return for the
-    reportData = {}
-    reportData["reportName"] = reportName
-    reportData["projectList"] = projectList
-    reportData["projectHierarchy"] = projectHierarchy
-    reportData["projectName"] = projectHierarchy["name"]
-    reportData["auditHistory"] = auditHistory
+            if inventoryItemDetails["checkpointState"] is not None:
+                # Collected by an earlier run of this report that did not complete
+                inventoryAuditHistory = audit_events.events_from_state(inventoryItemDetails["checkpointState"]["events"])
+                lastEventID = inventoryItemDetails["checkpointState"]["lastEventID"]
+            elif inventoryItemDetails["sharedState"] is not None:
+                # Collected by an earlier report of this batch run
+                lastEventID, inventoryAuditHistory = inventoryItemDetails["sharedState"]
+                inventoryAuditHistory = inventoryAuditHistory or {}
+            elif inventoryItemDetails["prefiltered"]:
+                # The inventory summary shows this item can not have any audit events
+                logger.info("    Skipping the history of inventory item %s (%s) within project %s as it has not been modified since it was created" %(inventoryItemName, inventoryID, projectName))
+                inventoryAuditHistory = {}
+                lastEventID = None
+                prefilteredItems += 1
+            elif inventoryHistoryFuture is None:
+                # Nothing has changed since the last report so the stored events are still valid
+                logger.debug("    No change since the previous report.  Reusing %s stored events" %len(previousEvents))
+                inventoryAuditHistory = audit_events.events_from_state(previousEvents)
+                lastEventID = inventoryItemDetails["previousState"]["lastEventID"]
+            else:
+                try:
+                    # Time spent waiting shows when the history requests can not keep up
+                    with report_metrics.metrics.phase("historyWait"):
+                        inventoryHistory = inventoryHistoryFuture.result()
+                    if inventoryHistory is None:
+                        raise ValueError("No inventory history returned")
+
+                    with report_metrics.metrics.phase("auditEvents"):
+                        inventoryAuditHistory, unresolvedEvents, lastEventID = get_inventory_audit_events(inventoryHistory, previousEvents, auditFieldMatcher, restrictedLicensesOnly, restrictedLicensePolicy, licenseResolver.resolve)
+                except Exception as error:
+                    record_collection_error(collectionErrors, "Unable to collect the history for inventory item <b>%s</b> (%s) within project <b>%s</b>: %s" %(inventoryItemName, inventoryID, projectName, error))
+                    continue
+
+            # Now map all of the license IDs captured for the new events to license names
+            licenseIDs = []
+            for event in unresolvedEvents:
+                licenseIDs.append(event.oldValue)
+                licenseIDs.append(event.newValue)
+
+            try:
+                with report_metrics.metrics.phase("licenseResolution"):
+                    licenseMappings = licenseResolver.resolve_many(licenseIDs)
+            except Exception as error:
+                record_collection_error(collectionErrors, "Unable to resolve the licenses for inventory item <b>%s</b> (%s) within project <b>%s</b>: %s" %(inventoryItemName, inventoryID, projectName, error))
+                continue
 
-    return reportData
+            for event in unresolvedEvents:
+                event.set_values(licenseMappings[event.oldValue], licenseMappings[event.newValue])
+
+            # With all names resolved the events can be stored for the next incremental report
+            if inventoryItemDetails["changeToken"] is not None:
+                projectState[inventoryID] = {}
+                projectState[inventoryID]["changeToken"] = inventoryItemDetails["changeToken"]
+                projectState[inventoryID]["lastEventID"] = lastEventID
+                projectState[inventoryID]["events"] = audit_events.events_to_state(inventoryAuditHistory)
+
+            if checkpoint is not None and inventoryItemDetails["checkpointState"] is None:
+                checkpointState = {}
+                checkpointState["changeToken"] = inventoryItemDetails["historyToken"]
+                checkpointState["lastEventID"] = lastEventID
+                checkpointState["events"] = audit_events.events_to_state(inventoryAuditHistory)
+                checkpoint.add_item(projectID, inventoryID, checkpointState)
+
+            # The events are kept as they are for the later reports of a batch run using this project
+            if sharedProjectCollection is not None and inventoryItemDetails["sharedState"] is None:
+                sharedProjectCollection.add_inventory_state(projectID, collectionKey, inventoryID, (lastEventID, inventoryAuditHistory or None))
+
+            # Was there at least one change to an audited field for this inventory item?
+            if inventoryAuditHistory:
+                yield inventoryID, audit_events.AuditItem(inventoryID, inventoryItemName, projectID, projectName, projectLink, baseURL, inventoryAuditHistory)
+
+        if report_settings.prefilterInventory:
+            logger.info("Inventory history requests avoided by the inventory pre-filter: %s" %prefilteredItems)
+            print("    Inventory history requests avoided by the inventory pre-filter: %s" %prefilteredItems)
+
+        # Only discard the checkpoint once everything has been collected
+        if checkpoint is not None and not collectionErrors:
+            checkpoint.complete()
+
+    finally:
+        # Stop any outstanding work if the consumer did not read all of the items
+        for projectFuture in projectFutures.values():
+            projectFuture.cancel()
+        projectExecutor.shutdown()
+        historyExecutor.shutdown()
+
+        # Persist any newly resolved license names for the next report run
+        license_resolver.release_license_resolver(licenseResolver)
+
+        if checkpoint is not None:
+            checkpoint.close()
+
+        if applicationDetailsCache is not None:
+            applicationDetailsCache.close()
+
+        if inventoryHistoryCache is not None:
+            inventoryHistoryCache.close()
+
+    logger.info("Exiting generate_audit_history")
+
+#----------------------------------------------#
+def get_inventory_audit_events(inventoryHistory, previousEvents, auditFieldMatcher, restrictedLicensesOnly, restrictedLicensePolicy, resolveLicenseName):
+
+    # Events are keyed by the history event ID and the audited field since a single
+    # history event may change more than one of the audited fields
+    inventoryAuditHistory = {}
+    unresolvedEvents = [] # License events holding license IDs rather than license names
+    lastEventID = None
+
+    for eventID in inventoryHistory:
+        inventoryChangeEvent = inventoryHistory[eventID]
+        lastEventID = eventID
+
+        for action in inventoryChangeEvent:
+            auditField = auditFieldMatcher.match(action["field"])
+            if auditField is None:
+                continue
+
+            isLicenseEvent = auditField == licenseAuditField
+
+            # Only license events are limited by the restricted license policy
+            if isLicenseEvent and restrictedLicensesOnly and not restrictedLicensePolicy.is_reportable_change(action["oldValue"], action["newValue"], resolveLicenseName):
+                continue
+
+            eventKey = get_event_key(eventID, auditField)
+
+            # Events already captured by a previous report only need to be merged
+            if eventKey in previousEvents:
+                inventoryAuditHistory[eventKey] = audit_events.AuditEvent.from_state(previousEvents[eventKey])
+                continue
+
+            # since this is an event we care about we need to capture the details for this inventory item
+            inventoryAuditHistory[eventKey] = audit_events.AuditEvent(auditField, action["date"], action["user"], action["userEmail"], action["oldValue"], action["newValue"])
+
+            # Specific for license events the IDs are mapped to license names once all
+            # of the events for the item have been collected so each ID is only resolved once
+            if isLicenseEvent:
+                unresolvedEvents.append(inventoryAuditHistory[eventKey])
+
+    return inventoryAuditHistory, unresolvedEvents, lastEventID
+
+#----------------------------------------------#
+def get_event_key(eventID, auditField):
+    return "%s|%s" %(eventID, auditField)
+
+#----------------------------------------------#
+class AuditFieldMatcher(object):
+    '''
+    Maps the field of an inventory history action to the audited field it belongs to.
+    An action belongs to the first audited field contained within its field name and
+    the result is memoized so each distinct field name is only evaluated once.
+    '''
+
+    def __init__(self, auditFields):
+        self.auditFields = tuple(auditFields)
+        self.matches = {}
+
+    def match(self, actionField):
+        try:
+            return self.matches[actionField]
+        except KeyError:
+            pass
+
+        auditField = None
+        for fieldName in self.auditFields:
+            if fieldName in actionField:
+                auditField = fieldName
+                break
+
+        self.matches[actionField] = auditField
+        return auditField
+
+#----------------------------------------------#
+def iterate_inventory_items(projectList, projectDetailsFutures, projectFutures, collectionErrors):
+
+    # Yield the component items for each project in order followed by an end of project marker.
+    # projectDetailsFutures holds the future of the first occurrence of each project in order
+    applicationDetails = {} # Only the application details are kept once a project is processed
+    failedProjectIDs = set()
+
+    for project in projectList:
+        projectID = project["projectID"]
+
+        # The inventory of a project appearing more than once is only reported for its first occurrence
+        if projectID in applicationDetails:
+            logger.debug("    Project %s already processed for an earlier position within the hierarchy" %project["projectName"])
+            project["applicationNameVersion"] = applicationDetails[projectID]["applicationNameVersion"]
+            continue
+        if projectID in failedProjectIDs:
+            continue
+
+        projectFuture = next(projectDetailsFutures)[1]
+        del projectFutures[projectID]
+
+        try:
+            projectDetails = projectFuture.result()
+        except Exception as error:
+            record_collection_error(collectionErrors, "Unable to collect the details for project <b>%s</b> (%s): %s" %(project["projectName"], projectID, error))
+            failedProjectIDs.add(projectID)
+            continue
+
+        # Add the applicationNameVersion to every place the project appears within the hierarchy
+        applicationDetails[projectID] = projectDetails["applicationDetails"]
+        project["applicationNameVersion"] = projectDetails["applicationDetails"]["applicationNameVersion"]
+
+        # Hand the items over one at a time so each is released once it has been processed
+        inventoryItems = projectDetails.pop("inventoryItems")
+        inventoryItems.reverse()
+        while inventoryItems:
+            inventoryItemDetails = inventoryItems.pop()
+            inventoryItemDetails["project"] = project
+            inventoryItemDetails["projectDetails"] = projectDetails
+            yield inventoryItemDetails
+
+        endOfProject = {}
+        endOfProject["project"] = project
+        endOfProject["projectDetails"] = projectDetails
+        endOfProject["inventoryItem"] = None
+        endOfProject["historyRequired"] = False
+        yield endOfProject
+
+#----------------------------------------------#
+def record_collection_error(collectionErrors, message):
+    logger.error(message)
+    collectionErrors.append(message)
+
+#----------------------------------------------#
+def prefetch(workItems, submit, lookAhead):
+
+    # Submit work up to lookAhead items ahead of the consumer and hand back each work item
+    # with its future in the original order
+    pendingWork = deque()
+
+    for workItem in workItems:
+        pendingWork.append((workItem, submit(workItem)))
+
+        if len(pendingWork) > lookAhead:
+            yield pendingWork.popleft()
+
+    while pendingWork:
+        yield pendingWork.popleft()
+
+#----------------------------------------------#
+def collect_project_details(baseURL, project, authToken, stateKey, checkpoint, auditFieldMatcher, collectionKey, applicationDetailsCache):
+    logger.debug("Entering collect_project_details.")
+
+    projectID = project["projectID"]
+    projectName = project["projectName"]
+
+    projectDetails = {}
+    projectDetails["stateKey"] = stateKey
+
+    # Projects shared with an earlier report of a batch run are only collected once
+    sharedProject = sharedProjectCollection.get_project(projectID) if sharedProjectCollection is not None else None
+
+    if sharedProject is not None:
+        logger.debug("    Reusing the details collected for project %s by an earlier report" %projectName)
+        projectDetails["applicationDetails"], projectInventorySummary = sharedProject  # Only the component items
+    else:
+        startTime = time.perf_counter()
+
+        with report_metrics.metrics.phase("applicationDetails"):
+            projectDetails["applicationDetails"] = get_application_details(baseURL, projectName, projectID, authToken, applicationDetailsCache)
+        with report_metrics.metrics.phase("inventorySummary"):
+            projectInventorySummary = call_codeinsight_api(CodeInsight_RESTAPIs.project.get_inventory_summary.get_project_inventory_without_vulns_summary, baseURL, projectID, authToken)
+
+        report_metrics.metrics.add_project_time(projectID, projectName, "detailsSeconds", time.perf_counter() - startTime)
+
+        if sharedProjectCollection is not None and projectInventorySummary:
+            sharedProjectCollection.add_project(projectID, projectDetails["applicationDetails"], get_shared_inventory_items(projectInventorySummary))
+
+    if not projectInventorySummary:
+        logger.warning("    Project %s contains no inventory items" %projectName)
+        print("Project contains no inventory items.")
+        projectInventorySummary = []
+
+    # Events collected by the previous incremental report for this project
+    if stateKey is not None:
+        previousProjectState = incremental_state.load_project_state(stateKey)
+    else:
+        previousProjectState = {}
+
+    # Only components have a history that is of interest for the report
+    inventoryItems = []
+    currentItem = 0
+    for inventoryItem in projectInventorySummary:
+        if inventoryItem["type"] != "Component":
+            continue
+
+        currentItem += 1
+
+        inventoryItemDetails = {}
+        inventoryItemDetails["inventoryItem"] = inventoryItem
+        inventoryItemDetails["currentItem"] = currentItem
+        inventoryItemDetails["previousState"] = previousProjectState.get(str(inventoryItem["id"]))
+        inventoryItemDetails["changeToken"] = incremental_state.get_inventory_change_token(inventoryItem) if stateKey is not None else None
+        inventoryItemDetails["historyToken"] = incremental_state.get_inventory_change_token(inventoryItem)
+        inventoryItemDetails["checkpointState"] = checkpoint.get_item(projectID, inventoryItem["id"], inventoryItemDetails["historyToken"]) if checkpoint is not None else None
+        inventoryItemDetails["sharedState"] = sharedProjectCollection.get_inventory_state(projectID, collectionKey, inventoryItem["id"]) if sharedProjectCollection is not None else None
+        inventoryItemDetails["prefiltered"] = False
+
+        # The history is only required if the item is new or changed since the previous report,
+        # was not already collected by an interrupted run of this report or an earlier report of a
+        # batch run and could have an audit event
+        if inventoryItemDetails["checkpointState"] is not None or inventoryItemDetails["sharedState"] is not None:
+            inventoryItemDetails["historyRequired"] = False
+        elif inventoryItemDetails["changeToken"] is not None and inventoryItemDetails["previousState"] and inventoryItemDetails["previousState"]["changeToken"] == inventoryItemDetails["changeToken"]:
+            inventoryItemDetails["historyRequired"] = False
+        elif report_settings.prefilterInventory and not inventory_may_have_audit_events(inventoryItem):
+            inventoryItemDetails["historyRequired"] = False
+            inventoryItemDetails["prefiltered"] = True
+        else:
+            inventoryItemDetails["historyRequired"] = True
+
+        inventoryItems.append(inventoryItemDetails)
+
+    projectDetails["inventoryItems"] = inventoryItems
+    projectDetails["inventoryItemCount"] = currentItem
+
+    return projectDetails
+
+#----------------------------------------------#
+def get_application_details(baseURL, projectName, projectID, authToken, applicationDetailsCache):
+    # The application custom fields of a project rarely change so they are reused from earlier report runs
+    if applicationDetailsCache is not None:
+        applicationDetails = applicationDetailsCache.get(projectID)
+        if applicationDetails is not None:
+            logger.debug("    Reusing the cached application details for project %s" %projectName)
+            return applicationDetails
+
+    applicationDetails = determine_application_details(baseURL, projectName, projectID, authToken)
+
+    if applicationDetailsCache is not None:
+        applicationDetailsCache.set(projectID, applicationDetails)
+
+    return applicationDetails
+
+#----------------------------------------------#
+def collect_inventory_history(baseURL, inventoryID, authToken, project, historyToken, inventoryHistoryCache, historyLicenseResolution):
+    # Runs on the history workers so the time is attributed to the project of the item
+    startTime = time.perf_counter()
+    try:
+        with report_metrics.metrics.phase("inventoryHistory"):
+            # Without a change token there is no way to tell if a stored history is still valid
+            if inventoryHistoryCache is None or historyToken is None:
+                inventoryHistory = call_codeinsight_api(CodeInsight_RESTAPIs.inventory.get_inventory_history.get_inventory_history_details, baseURL, inventoryID, authToken)
+            else:
+                inventoryHistory = inventoryHistoryCache.get(inventoryID, historyToken)
+                if inventoryHistory is None:
+                    inventoryHistory = call_codeinsight_api(CodeInsight_RESTAPIs.inventory.get_inventory_history.get_inventory_history_details, baseURL, inventoryID, authToken)
+                    if inventoryHistory is not None:
+                        inventoryHistoryCache.add(inventoryID, historyToken, inventoryHistory)
+    finally:
+        report_metrics.metrics.add_project_time(project["projectID"], project["projectName"], "historySeconds", time.perf_counter() - startTime)
+
+    if inventoryHistory is not None:
+        with report_metrics.metrics.phase("licenseResolution"):
+            resolve_history_licenses(inventoryHistory, *historyLicenseResolution)
+
+    return inventoryHistory
+
+#----------------------------------------------#
+def resolve_history_licenses(inventoryHistory, licenseResolver, auditFieldMatcher, restrictedLicensesOnly, restrictedLicensePolicy):
+    # Resolve the license IDs of the license events that will be reported.  Anything that can
+    # not be resolved here is tried again, and reported, by the collector
+    try:
+        licenseIDs = []
+        for inventoryChangeEvent in inventoryHistory.values():
+            for action in inventoryChangeEvent:
+                if auditFieldMatcher.match(action["field"]) != licenseAuditField:
+                    continue
+                if restrictedLicensesOnly and not restrictedLicensePolicy.is_reportable_change(action["oldValue"], action["newValue"], licenseResolver.resolve):
+                    continue
+                licenseIDs += [action["oldValue"], action["newValue"]]
+
+        licenseResolver.resolve_many(licenseIDs)
+    except Exception as error:
+        logger.debug("    Unable to resolve the licenses of the history on the worker: %s" %error)
+
+#----------------------------------------------#
+class ProjectCollection(object):
+    '''
+    Data collected for the projects shared by several reports generated within the same
+    process so those projects are collected once.  Before the first report the number of
+    reports including each project is set through set_report_projects and only the projects of
+    more than one report are kept, each until the last report including it is released.  The
+    audit events of an inventory item depend on the report fields and options so are kept per
+    collection key.
+    '''
+
+    def __init__(self):
+        self.projects = {}
+        self.projectHierarchies = {} # Hierarchy of each project with a report still to be created
+        self.inventoryStates = {} # Events of the inventory items of each project
+        self.pendingReports = set() # Projects with a report still to be created
+        self.reportProjects = {} # Projects included within the report of each project
+        self.remainingReports = {} # Number of reports still to be created including each project
+        self.lock = threading.Lock()
+
+    def start_reports(self, reportProjectIDs):
+        with self.lock:
+            self.pendingReports = set(str(projectID) for projectID in reportProjectIDs)
+
+    def set_report_projects(self, reportProjects):
+        with self.lock:
+            for reportProjectID, projectIDs in reportProjects.items():
+                self.reportProjects[str(reportProjectID)] = set(str(projectID) for projectID in projectIDs)
+                for projectID in self.reportProjects[str(reportProjectID)]:
+                    self.remainingReports[projectID] = self.remainingReports.get(projectID, 0) + 1
+
+    def is_shared(self, projectID):
+        # Called with the lock held.  The report being created is one of the remaining reports
+        return self.remainingReports.get(str(projectID), 0) > 1
+
+    def release_report(self, reportProjectID):
+        # Drop everything the reports still to be created no longer need
+        with self.lock:
+            self.pendingReports.discard(str(reportProjectID))
+            self.projectHierarchies.pop(str(reportProjectID), None)
+
+            for projectID in self.reportProjects.pop(str(reportProjectID), set()):
+                self.remainingReports[projectID] -= 1
+                if self.remainingReports[projectID] <= 0:
+                    del self.remainingReports[projectID]
+                    self.projects.pop(projectID, None)
+                    self.inventoryStates.pop(projectID, None)
+
+    def get_project(self, projectID):
+        with self.lock:
+            return self.projects.get(str(projectID))
+
+    def add_project(self, projectID, applicationDetails, inventoryItems):
+        with self.lock:
+            if self.is_shared(projectID):
+                self.projects[str(projectID)] = (applicationDetails, inventoryItems)
+
+    def get_project_hierarchy(self, projectID):
+        with self.lock:
+            return self.projectHierarchies.get(str(projectID))
+
+    def add_project_hierarchy(self, projectHierarchy):
+        # A hierarchy holds the hierarchies of its child projects so keep any with a report to create
+        with self.lock:
+            for projectID, childHierarchy in project_cache.get_child_hierarchies(projectHierarchy).items():
+                if projectID in self.pendingReports:
+                    self.projectHierarchies[projectID] = childHierarchy
+
+    def get_inventory_state(self, projectID, collectionKey, inventoryID):
+        with self.lock:
+            return self.inventoryStates.get(str(projectID), {}).get((collectionKey, inventoryID))
+
+    def add_inventory_state(self, projectID, collectionKey, inventoryID, inventoryState):
+        with self.lock:
+            if self.is_shared(projectID):
+                self.inventoryStates.setdefault(str(projectID), {})[(collectionKey, inventoryID)] = inventoryState
+
+#----------------------------------------------#
+def enable_shared_project_collection():
+    global sharedProjectCollection
+
+    if sharedProjectCollection is None:
+        sharedProjectCollection = ProjectCollection()
+
+#----------------------------------------------#
+def plan_shared_project_collection(baseURL, reportProjectIDs, authToken, includeChildProjects):
+    logger.info("Entering plan_shared_project_collection")
+
+    # The hierarchy of every report is needed to know which projects are part of more than one
+    # report.  The hierarchies are kept for the reports so each is only requested once
+    sharedProjectCollection.start_reports(reportProjectIDs)
+
+    reportProjects = {}
+    for reportProjectID in reportProjectIDs:
+        try:
+            projectHierarchy = get_project_hierarchy(baseURL, reportProjectID, authToken)
+        except Exception:
+            # The report itself will try again and create the error report
+            logger.exception("Unable to collect the project hierarchy for project %s" %reportProjectID)
+            continue
+
+        if includeChildProjects:
+            reportProjects[reportProjectID] = project_cache.get_child_hierarchies(projectHierarchy).keys()
+        else:
+            reportProjects[reportProjectID] = [projectHierarchy["id"]]
+
+    sharedProjectCollection.set_report_projects(reportProjects)
+
+    projectCounts = {}
+    for projectIDs in reportProjects.values():
+        for projectID in projectIDs:
+            projectCounts[projectID] = projectCounts.get(projectID, 0) + 1
+    sharedProjects = [projectID for projectID, projectCount in projectCounts.items() if projectCount > 1]
+
+    logger.info("    %s of %s projects are part of more than one report" %(len(sharedProjects), len(projectCounts)))
+
+#----------------------------------------------#
+def release_shared_projects(reportProjectID):
+    if sharedProjectCollection is not None:
+        sharedProjectCollection.release_report(reportProjectID)
+
+#----------------------------------------------#
+def close_shared_project_collection():
+    global sharedProjectCollection
+    sharedProjectCollection = None
+
+#----------------------------------------------#
+def get_shared_inventory_items(projectInventorySummary):
+    # Only the component items and the fields read while collecting them are kept for later reports
+    fieldNames = ["id", "name", "type", "selectedLicenseId", report_settings.inventoryLastUpdatedField, report_settings.inventoryCreatedField]
+    return [{fieldName : inventoryItem[fieldName] for fieldName in fieldNames if fieldName in inventoryItem} for inventoryItem in projectInventorySummary if inventoryItem["type"] == "Component"]
+
+#----------------------------------------------#
+def inventory_may_have_audit_events(inventoryItem):
+
+    # An item that has not been modified since it was created can not have had any field changed
+    createdOn = incremental_state.get_inventory_field(inventoryItem, report_settings.inventoryCreatedField)
+    lastUpdated = incremental_state.get_inventory_field(inventoryItem, report_settings.inventoryLastUpdatedField)
+
+    if createdOn and lastUpdated and createdOn == lastUpdated:
+        return False
+
+    # Without a signal the history has to be checked
+    return True
+
+#----------------------------------------------#
+def call_codeinsight_api(apiFunction, *args):
+    # Every REST call made while collecting the report data goes through here so the
+    # total number of requests in flight against the server is capped
+    with requestLimiter:
+        return apiFunction(*args)
+
+#----------------------------------------------#
+def get_project_hierarchy(baseURL, projectID, authToken):
+    logger.debug("Entering get_project_hierarchy.")
+
+    # The hierarchies of the reports of a batch run are collected before the first report
+    if sharedProjectCollection is not None:
+        projectHierarchy = sharedProjectCollection.get_project_hierarchy(projectID)
+        if projectHierarchy is not None:
+            logger.debug("    Reusing the hierarchy collected for project %s by an earlier report" %projectID)
+            return projectHierarchy
+
+    projectHierarchyCache = project_cache.open_project_hierarchy_cache(baseURL)
+    try:
+        projectHierarchy = projectHierarchyCache.get(projectID) if projectHierarchyCache is not None else None
+
+        if projectHierarchy is None:
+            projectHierarchy = call_codeinsight_api(CodeInsight_RESTAPIs.project.get_child_projects.get_child_projects_recursively, baseURL, projectID, authToken)
+            if projectHierarchyCache is not None:
+                projectHierarchyCache.set(projectID, projectHierarchy)
+        else:
+            logger.debug("    Reusing the cached hierarchy for project %s" %projectID)
+    finally:
+        if projectHierarchyCache is not None:
+            projectHierarchyCache.close()
+
+    if sharedProjectCollection is not None:
+        sharedProjectCollection.add_project_hierarchy(projectHierarchy)
 
+    return projectHierarchy
 
 #----------------------------------------------#
 def create_project_hierarchy(project, parentID, projectList, baseURL):
@@ -202,7 +801,7 @@ def determine_application_details(baseURL, projectName, projectID, authToken):
     applicationPublisher = ""
     applicationDetailsString = ""
 
-    projectInformation = CodeInsight_RESTAPIs.project.get_project_information.get_project_information_summary(baseURL, projectID, authToken)
+    projectInformation = call_codeinsight_api(CodeInsight_RESTAPIs.project.get_project_information.get_project_information_summary, baseURL, projectID, authToken)
 
     # Project level custom fields added in 2022R1
     if "customFields" in projectInformation:
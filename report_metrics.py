@@ -0,0 +1,147 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_metrics.py
+'''
+import logging
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class ReportMetrics(object):
+    '''
+    Timings and REST call statistics for a single report.  Phases run by concurrent workers
+    (i.e. the inventory history requests) are summed over the workers so their time can be
+    larger than the wall time of the report.  Requests are grouped by endpoint with the
+    numeric IDs of the URL removed.
+    '''
+
+    def __init__(self):
+        self.startTime = time.time()
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.endpoints = {}
+        self.projects = {}
+
+    #---------------------------------------#
+    @contextmanager
+    def phase(self, phaseName):
+        startTime = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase_time(phaseName, time.perf_counter() - startTime)
+
+    #---------------------------------------#
+    def add_phase_time(self, phaseName, seconds):
+        with self.lock:
+            phaseDetails = self.phases.setdefault(phaseName, {"count" : 0, "seconds" : 0.0})
+            phaseDetails["count"] += 1
+            phaseDetails["seconds"] += seconds
+
+    #---------------------------------------#
+    def add_project_time(self, projectID, projectName, timingName, seconds):
+        with self.lock:
+            projectDetails = self.projects.setdefault(projectID, {"projectName" : projectName})
+            projectDetails[timingName] = projectDetails.get(timingName, 0.0) + seconds
+            countName = timingName.replace("Seconds", "Count")
+            projectDetails[countName] = projectDetails.get(countName, 0) + 1
+
+    #---------------------------------------#
+    def record_request(self, method, url, statusCode, bytesSent, bytesReceived, seconds):
+        endpoint = method + " " + get_endpoint_name(url)
+
+        with self.lock:
+            endpointDetails = self.endpoints.get(endpoint)
+            if endpointDetails is None:
+                endpointDetails = {"requests" : 0, "errors" : 0, "bytesSent" : 0, "bytesReceived" : 0, "latencies" : []}
+                self.endpoints[endpoint] = endpointDetails
+
+            endpointDetails["requests"] += 1
+            if statusCode is None or statusCode >= 400:
+                endpointDetails["errors"] += 1
+            endpointDetails["bytesSent"] += bytesSent
+            endpointDetails["bytesReceived"] += bytesReceived
+            endpointDetails["latencies"].append(seconds)
+
+    #---------------------------------------#
+    def get_summary(self):
+        with self.lock:
+            summary = {}
+            summary["startTime"] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.startTime))
+            summary["elapsedSeconds"] = round(time.time() - self.startTime, 3)
+            summary["phases"] = {phaseName : {"count" : phaseDetails["count"], "seconds" : round(phaseDetails["seconds"], 3)} for phaseName, phaseDetails in self.phases.items()}
+
+            summary["endpoints"] = {}
+            for endpoint, endpointDetails in sorted(self.endpoints.items()):
+                latencies = sorted(endpointDetails["latencies"])
+                endpointSummary = {key : value for key, value in endpointDetails.items() if key != "latencies"}
+                endpointSummary["latency"] = {
+                    "p50" : round(get_percentile(latencies, 50), 4),
+                    "p90" : round(get_percentile(latencies, 90), 4),
+                    "p99" : round(get_percentile(latencies, 99), 4),
+                    "max" : round(latencies[-1], 4) if latencies else 0.0,
+                    "total" : round(sum(latencies), 3),
+                }
+                summary["endpoints"][endpoint] = endpointSummary
+
+            # Slowest projects first
+            summary["projects"] = []
+            for projectID, projectDetails in self.projects.items():
+                projectSummary = {"projectID" : projectID}
+                projectSummary.update({key : round(value, 3) if isinstance(value, float) else value for key, value in projectDetails.items()})
+                summary["projects"].append(projectSummary)
+            summary["projects"].sort(key=lambda projectSummary: -(projectSummary.get("detailsSeconds", 0) + projectSummary.get("historySeconds", 0)))
+
+            return summary
+
+    #---------------------------------------#
+    def log_summary(self):
+        summary = self.get_summary()
+
+        logger.info("Report metrics:  %ss elapsed" %summary["elapsedSeconds"])
+        for phaseName, phaseDetails in summary["phases"].items():
+            logger.info("    Phase %-20s %8.3fs  (%s)" %(phaseName, phaseDetails["seconds"], phaseDetails["count"]))
+        for endpoint, endpointSummary in summary["endpoints"].items():
+            logger.info("    %-60s %6s requests  %4s errors  %10s bytes  p50 %.3fs  p90 %.3fs  p99 %.3fs" %(endpoint, endpointSummary["requests"], endpointSummary["errors"], endpointSummary["bytesReceived"], endpointSummary["latency"]["p50"], endpointSummary["latency"]["p90"], endpointSummary["latency"]["p99"]))
+        for projectSummary in summary["projects"][:10]:
+            logger.info("    Project %s (%s): %s" %(projectSummary["projectName"], projectSummary["projectID"], projectSummary))
+
+    #---------------------------------------#
+    def write_metrics_file(self, metricsFile):
+        logger.info("    Writing report metrics to %s" %metricsFile)
+        with open(metricsFile, "w") as file_ptr:
+            json.dump(self.get_summary(), file_ptr, indent=4)
+        return metricsFile
+
+metrics = ReportMetrics()  # Metrics of the report currently being created
+
+#------------------------------------------------------------------#
+def reset_metrics():
+    global metrics
+    metrics = ReportMetrics()
+    return metrics
+
+#------------------------------------------------------------------#
+def get_endpoint_name(url):
+    # i.e. https://server:8443/codeinsight/api/inventories/123/history?page=1 becomes
+    # /codeinsight/api/inventories/{id}/history
+    path = re.sub(r"^[a-z]+://[^/]+", "", url.split("?")[0])
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+#------------------------------------------------------------------#
+def get_percentile(sortedValues, percentile):
+    # Nearest rank percentile of an already sorted list
+    if not sortedValues:
+        return 0.0
+    rank = max(1, int(round(percentile / 100.0 * len(sortedValues) + 0.5)))
+    return sortedValues[min(rank, len(sortedValues)) - 1]
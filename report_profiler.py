@@ -0,0 +1,163 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_profiler.py
+'''
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import cProfile
+import pstats
+import io
+from collections import Counter
+from contextlib import contextmanager
+
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+profileModes = ["sample", "cprofile"]
+activeSampler = None  # Sampler of the profiled run, if any
+
+#------------------------------------------------------------------#
+class StackSampler(object):
+    '''
+    Samples the stack of every thread at a fixed interval and counts the identical stacks.
+    The counts are written in the collapsed stack format read by flamegraph.pl and speedscope
+    (one "thread;outer;...;inner count" line per stack).  Threads of the same pool share a name
+    so their samples are combined.
+    '''
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stackCounts = Counter()
+        self.samples = 0
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="ReportStackSampler", daemon=True)
+
+    #---------------------------------------#
+    def start(self):
+        self.thread.start()
+
+    #---------------------------------------#
+    def stop(self):
+        self.stopEvent.set()
+        self.thread.join()
+
+    #---------------------------------------#
+    def restart(self):
+        # A stopped thread can not be started again so sample on a new one
+        self.stopEvent = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="ReportStackSampler", daemon=True)
+        self.thread.start()
+
+    #---------------------------------------#
+    def run(self):
+        samplerThreadID = threading.get_ident()
+
+        while not self.stopEvent.wait(self.interval):
+            threadNames = {thread.ident : thread.name for thread in threading.enumerate()}
+
+            for threadID, frame in sys._current_frames().items():
+                if threadID == samplerThreadID:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append("%s (%s:%s)" %(frame.f_code.co_name, os.path.basename(frame.f_code.co_filename), frame.f_code.co_firstlineno))
+                    frame = frame.f_back
+
+                # i.e. ThreadPoolExecutor-0_3 becomes ThreadPoolExecutor
+                threadName = re.sub(r"[-_]\d+", "", threadNames.get(threadID, "Thread"))
+                stack.append(threadName)
+                stack.reverse()
+
+                self.stackCounts[";".join(frameName.replace(";", ":") for frameName in stack)] += 1
+
+            self.samples += 1
+
+    #---------------------------------------#
+    def write_collapsed_stacks(self, stacksFile):
+        with open(stacksFile, "w") as file_ptr:
+            for stack, count in self.stackCounts.most_common():
+                file_ptr.write("%s %s\n" %(stack, count))
+
+#------------------------------------------------------------------#
+def get_profile_mode():
+    # The environment allows a single run within the report framework to be profiled
+    profileMode = os.environ.get("REPORT_PROFILE") or report_settings.profileMode
+    if not profileMode:
+        return None
+
+    profileMode = profileMode.lower()
+    if profileMode not in profileModes:
+        logger.warning("Unknown profile mode %s.  Valid options are %s" %(profileMode, "/".join(profileModes)))
+        return None
+
+    return profileMode
+
+#------------------------------------------------------------------#
+def run_profiled(function, logfileName):
+    # Call function under the requested profiler and write the results next to the log file
+    profileMode = get_profile_mode()
+    if profileMode is None:
+        return function()
+
+    profileFileBase = os.path.splitext(logfileName)[0] + "-profile"
+    logger.info("Profiling the report (%s) to %s.*" %(profileMode, profileFileBase))
+    print("    Profiling the report (%s) to %s.*" %(profileMode, profileFileBase))
+
+    # The sampler sees every thread while cProfile only sees the main thread
+    sampler = StackSampler(report_settings.profileSampleInterval)
+    profiler = cProfile.Profile() if profileMode == "cprofile" else None
+
+    global activeSampler
+
+    startTime = time.perf_counter()
+    sampler.start()
+    activeSampler = sampler
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        return function()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        activeSampler = None
+        sampler.stop()
+        elapsedTime = time.perf_counter() - startTime
+
+        sampler.write_collapsed_stacks(profileFileBase + "-stacks.txt")
+        logger.info("    %s stack samples over %.3fs written to %s-stacks.txt" %(sampler.samples, elapsedTime, profileFileBase))
+
+        if profiler is not None:
+            profiler.dump_stats(profileFileBase + ".pstats")
+
+            # The most expensive calls are also logged so the log alone is enough for a first look
+            profileSummary = io.StringIO()
+            pstats.Stats(profiler, stream=profileSummary).sort_stats("cumulative").print_stats(30)
+            logger.info("    Profile written to %s.pstats\n%s" %(profileFileBase, profileSummary.getvalue()))
+
+#------------------------------------------------------------------#
+@contextmanager
+def paused_sampling():
+    # Stop the sampler thread while the caller forks so the child does not start from a copy
+    # of the process taken partway through a sample
+    sampler = activeSampler
+    if sampler is None:
+        yield
+        return
+
+    sampler.stop()
+    try:
+        yield
+    finally:
+        sampler.restart()
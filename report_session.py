@@ -0,0 +1,204 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_session.py
+'''
+import logging
+import random
+import sys
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import report_settings
+import report_metrics
+
+logger = logging.getLogger(__name__)
+
+sharedSession = None
+
+#------------------------------------------------------------------#
+class SessionRequests(object):
+    '''
+    Stand in for the requests module within the CodeInsight_RESTAPIs modules so their
+    calls are made through a shared session and reuse pooled keep-alive connections.
+    Anything other than the request methods (exceptions, status codes...) comes from requests.
+    '''
+
+    def __init__(self, session):
+        self.session = session
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.session.put(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.session.delete(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+#------------------------------------------------------------------#
+class TokenBucket(object):
+    '''
+    Token bucket limiting the rate requests are sent to the server while still allowing
+    short bursts.  acquire blocks until a token is available.
+    '''
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        # A bucket that can not hold a whole token would never allow a request
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.lastRefill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.lastRefill) * self.rate)
+                self.lastRefill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                waitTime = (1 - self.tokens) / self.rate
+
+            time.sleep(waitTime)
+
+#------------------------------------------------------------------#
+class ResilientSession(requests.Session):
+    '''
+    Session applying a per endpoint timeout, the shared rate limit and retries with
+    exponential backoff and jitter for connection failures and server side errors.
+    '''
+
+    def __init__(self, rateLimiter):
+        super(ResilientSession, self).__init__()
+        self.rateLimiter = rateLimiter
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = get_request_timeout(url)
+
+        # Only retry requests that can safely be sent again
+        if method.upper() in report_settings.retryMethods:
+            maxAttempts = 1 + max(0, report_settings.maxRequestRetries)
+        else:
+            maxAttempts = 1
+
+        for attempt in range(1, maxAttempts + 1):
+            if self.rateLimiter is not None:
+                self.rateLimiter.acquire()
+
+            response = None
+            startTime = time.perf_counter()
+            try:
+                response = super(ResilientSession, self).request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+                record_request_metrics(method, url, kwargs, None, time.perf_counter() - startTime)
+                if attempt == maxAttempts:
+                    logger.error("%s %s failed after %s attempts: %s" %(method, url, attempt, error))
+                    raise
+                logger.warning("%s %s failed on attempt %s of %s: %s" %(method, url, attempt, maxAttempts, error))
+            else:
+                record_request_metrics(method, url, kwargs, response, time.perf_counter() - startTime)
+                if response.status_code not in report_settings.retryStatusCodes or attempt == maxAttempts:
+                    return response
+                logger.warning("%s %s returned %s on attempt %s of %s" %(method, url, response.status_code, attempt, maxAttempts))
+                response.close()
+
+            time.sleep(get_retry_delay(attempt, response))
+
+#------------------------------------------------------------------#
+def record_request_metrics(method, url, kwargs, response, seconds):
+    # Streamed uploads report their size while the response body has already been read
+    requestData = kwargs.get("data")
+    bytesSent = len(requestData) if hasattr(requestData, "__len__") else 0
+
+    if response is None:
+        report_metrics.metrics.record_request(method.upper(), url, None, bytesSent, 0, seconds)
+    else:
+        contentLength = response.headers.get("Content-Length", "")
+        bytesReceived = int(contentLength) if contentLength.isdigit() else len(response.content or b"")
+        report_metrics.metrics.record_request(method.upper(), url, response.status_code, bytesSent, bytesReceived, seconds)
+
+#------------------------------------------------------------------#
+def get_request_timeout(url):
+    # The first pattern found within the URL determines the (connect, read) timeout
+    for urlPattern, timeout in report_settings.requestTimeouts:
+        if urlPattern in url:
+            return timeout
+    return None
+
+#------------------------------------------------------------------#
+def get_retry_delay(attempt, response):
+    # Exponential backoff with full jitter so retries from the workers do not arrive together
+    backoff = min(report_settings.retryBackoffMax, report_settings.retryBackoffBase * (2 ** (attempt - 1)))
+    delay = random.uniform(0, backoff)
+
+    # Honour the server if it asked for a specific delay
+    if response is not None:
+        retryAfter = response.headers.get("Retry-After", "")
+        if retryAfter.isdigit():
+            delay = max(delay, min(report_settings.retryBackoffMax, int(retryAfter)))
+
+    return delay
+
+#------------------------------------------------------------------#
+def create_session():
+    logger.info("Entering create_session")
+
+    rateLimiter = TokenBucket(report_settings.requestsPerSecond, report_settings.requestBurst) if report_settings.requestsPerSecond else None
+    session = ResilientSession(rateLimiter)
+
+    # Enough pooled connections for every request that can be in flight at the same time.
+    # The certificate bundle from REQUESTS_CA_BUNDLE is still picked up for each request
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, report_settings.maxConcurrentRequests))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+#------------------------------------------------------------------#
+def install_shared_session():
+    logger.info("Entering install_shared_session")
+    global sharedSession
+
+    if sharedSession is None:
+        sharedSession = create_session()
+
+    # Replace the requests reference of every loaded REST API module with the shared session
+    sessionRequests = SessionRequests(sharedSession)
+    for moduleName, module in list(sys.modules.items()):
+        # A module may still hold the session of an earlier report created by the same process
+        moduleRequests = getattr(module, "requests", None)
+        if moduleName.startswith("CodeInsight_RESTAPIs.") and (moduleRequests is requests or isinstance(moduleRequests, SessionRequests)):
+            module.requests = sessionRequests
+            logger.debug("    Shared session installed for %s" %moduleName)
+
+    return sharedSession
+
+#------------------------------------------------------------------#
+def close_shared_session():
+    global sharedSession
+
+    if sharedSession is not None:
+        sharedSession.close()
+        sharedSession = None
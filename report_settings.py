@@ -0,0 +1,157 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_settings.py
+'''
+import os
+
+# Tuning values for the data collection and generation of the report.  These are not
+# exposed as report options since they relate to the Code Insight server
+# the report is running against rather than the content of the report itself.
+
+# Maximum number of inventory history requests that can be outstanding at once.
+# The default is kept well below the default Tomcat worker thread count (200)
+# so that report generation does not starve interactive users of the server
+maxInventoryHistoryWorkers = 8
+
+# Number of projects within the hierarchy whose project level details (application
+# details and inventory summary) are collected at the same time
+maxProjectWorkers = 4
+
+# Overall cap on the number of REST requests in flight against Code Insight at any
+# point in time across all of the worker pools
+maxConcurrentRequests = 12
+
+# SQLite file used to persist data between report runs such as license names
+cacheFile = os.path.join(os.path.dirname(os.path.realpath(__file__)), "_report_cache.db")
+
+# Number of seconds a cached license name is considered valid before it is looked up again
+licenseCacheTimeToLive = 30 * 24 * 60 * 60
+
+# Only fetch the history for inventory items that have changed since the previous report
+# for the same project and options and reuse the stored audit events for the others
+incrementalAudit = False
+
+# Inventory summary field holding the last time an inventory item was modified, used to
+# determine if an item has changed since the last report.  A warning is logged if the server
+# does not return it, in which case the history of every item is collected
+inventoryLastUpdatedField = "updatedOn"
+
+# Number of inventory history requests (as a multiple of maxInventoryHistoryWorkers) that are
+# queued ahead of the item currently being written to the report.  This bounds the number of
+# histories held in memory while still keeping the history workers busy
+historyLookAheadFactor = 4
+
+# How the audit rows are written to the HTML report.  "inline" writes every row as a static
+# table row while "json" embeds the rows as a compact json array that DataTables renders on
+# demand, which keeps very large reports responsive
+htmlTableMode = "inline"
+
+# Sustained number of requests per second sent to Code Insight along with the size of the
+# burst allowed above that rate (at least 1).  Set requestsPerSecond to 0 to disable the rate limit
+requestsPerSecond = 25
+requestBurst = 25
+
+# Requests failing with a connection error, timeout or one of the status codes below are
+# retried with an exponential backoff (base * 2^attempt seconds capped at max plus jitter)
+maxRequestRetries = 5
+retryBackoffBase = 1.0
+retryBackoffMax = 60.0
+retryStatusCodes = [429, 500, 502, 503, 504]
+retryMethods = ["GET", "HEAD", "OPTIONS"]
+
+# (connect, read) timeouts in seconds for the REST endpoints.  The first pattern found
+# within the request URL is used
+requestTimeouts = [
+    ("/history", (15, 300)),
+    ("/reports/", (15, 900)),
+    ("", (15, 120)),
+]
+
+# Journal the inventory items collected so that a run which dies part way through can be
+# resumed by the next run of the same report and options.  Items are written every
+# checkpointInterval items or checkpointSeconds, whichever comes first, and a journal
+# older than checkpointTimeToLive seconds is ignored
+checkpointEnabled = True
+checkpointInterval = 100
+checkpointSeconds = 30
+checkpointTimeToLive = 24 * 60 * 60
+
+# Skip the history request for inventory items that have not been modified since they were
+# created, based on the created and last updated timestamps of the inventory summary.  This
+# relies on every change to an inventory item, including a license change, updating its last
+# updated timestamp.  Code Insight does not document that behaviour so only enable this once
+# it has been confirmed for the server, as the skipped items are left out of the report.  Each
+# skipped item is logged.  inventoryCreatedField is the createdOn field of the inventory summary
+# and items without it, or without inventoryLastUpdatedField, are always fetched
+prefilterInventory = False
+inventoryCreatedField = "createdOn"
+
+# Additional restricted license rules (license IDs, SPDX identifiers and wildcards such as
+# GPL-*) applied on top of the license IDs within restricted_licenses.py
+restrictedLicensePolicyFile = os.path.join(os.path.dirname(os.path.realpath(__file__)), "restricted_licenses.json")
+
+# Inventory fields audited by the report.  The events for every field are collected from a
+# single history request per inventory item and each name is matched against the field of
+# the history actions (i.e. "License", "Version", "Component", "Review Status").  License
+# values are mapped to license names while all other fields are reported as recorded
+auditFields = ["License"]
+
+# Machine readable report artifacts written alongside the html report and included within
+# the downloadable archive.  Any of "csv", "jsonl" and "xlsx"
+exportFormats = ["csv", "jsonl", "xlsx"]
+
+# Write the machine readable report artifacts within a worker process so they are created
+# concurrently with the html report.  Items are sent to the worker in batches of
+# artifactBatchSize with at most artifactQueueSize batches waiting.  Only used where
+# processes can be forked (i.e. not on Windows) and no other thread is running
+artifactWorkerProcess = True
+artifactBatchSize = 100
+artifactQueueSize = 16
+
+# Compression level (0-9) for the report archives.  The downloadable archive is built in
+# memory until it reaches archiveSpoolSize bytes and is then spooled to a temporary file
+archiveCompressionLevel = 6
+archiveSpoolSize = 64 * 1024 * 1024
+
+# The report archive is streamed to Code Insight in uploadChunkSize blocks so the memory used
+# does not depend on the size of the archive.  A failed upload is sent again up to
+# maxUploadRetries times and progress is logged every uploadProgressInterval bytes
+uploadChunkSize = 1024 * 1024
+maxUploadRetries = 3
+uploadProgressInterval = 50 * 1024 * 1024
+
+# Timings of each phase of the report and the requests made to each REST endpoint are logged
+# and written to a metrics file within the downloadable archive.  showReportMetrics also adds
+# them to the footer of the html report
+writeReportMetrics = True
+showReportMetrics = False
+
+# Profile a report run and write the results next to the log file.  "sample" records the stack
+# of every thread each profileSampleInterval seconds as collapsed stacks for a flame graph and
+# is light enough for a production run.  "cprofile" also writes a pstats file of the main
+# thread.  The REPORT_PROFILE environment variable overrides profileMode
+profileMode = None
+profileSampleInterval = 0.01
+
+# Number of seconds the application details of a project (the Application Name, Version and
+# Publisher custom fields) and the project hierarchy are reused from the report cache before
+# being collected again.  0 disables the cache.  The hierarchy is not cached by default as a
+# newly added child project would be missing from the report until the entry expires.  Batch
+# runs always reuse the hierarchy of a child project from the hierarchy of its parent
+applicationDetailsCacheTimeToLive = 24 * 60 * 60
+projectHierarchyCacheTimeToLive = 0
+
+# Keep the inventory history responses within the report cache so unchanged inventory items
+# (based on their last updated timestamp and selected license) are not collected again by
+# later reports.  The histories are stored compressed and the least recently used entries are
+# evicted once they take more than historyCacheMaxSize bytes.  New entries are written in
+# batches of historyCacheWriteBatchSize.  Use "python report_cache.py inspect|purge" to
+# look at or clear the cache
+historyCacheEnabled = False
+historyCacheMaxSize = 256 * 1024 * 1024
+historyCacheWriteBatchSize = 100
@@ -0,0 +1,131 @@
+'''
+Copyright 2026 Flexera Software LLC
+See LICENSE.TXT for full license text
+SPDX-License-Identifier: MIT
+
+Author : agent
+Created On : Sun Oct 18 2026
+File : report_upload.py
+'''
+import logging
+import os
+import time
+import uuid
+
+import requests
+
+import report_session
+import report_settings
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------#
+class MultipartFileStream(object):
+    '''
+    File like multipart/form-data body for a single file.  The file is read in chunks as
+    the request is sent so the archive is never held in memory.  The length is known up
+    front so the request is sent with a Content-Length rather than chunked encoding.
+    '''
+
+    def __init__(self, fieldName, fileName):
+        self.fileName = fileName
+        self.boundary = uuid.uuid4().hex
+        self.contentType = "multipart/form-data; boundary=%s" %self.boundary
+
+        self.preamble = ("--%s\r\nContent-Disposition: form-data; name=\"%s\"; filename=\"%s\"\r\nContent-Type: application/zip\r\n\r\n" %(self.boundary, fieldName, os.path.basename(fileName))).encode("utf-8")
+        self.epilogue = ("\r\n--%s--\r\n" %self.boundary).encode("utf-8")
+        self.fileSize = os.path.getsize(fileName)
+
+        self.file_ptr = None
+        self.bytesSent = 0
+        self.nextProgress = report_settings.uploadProgressInterval
+
+    #---------------------------------------#
+    def __len__(self):
+        return len(self.preamble) + self.fileSize + len(self.epilogue)
+
+    #---------------------------------------#
+    def open(self):
+        self.close()
+        self.file_ptr = open(self.fileName, "rb")
+        self.bytesSent = 0
+        self.nextProgress = report_settings.uploadProgressInterval
+        self.parts = [self.preamble, None, self.epilogue]  # None marks the file contents
+
+    #---------------------------------------#
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = report_settings.uploadChunkSize
+
+        while self.parts:
+            if self.parts[0] is None:
+                chunk = self.file_ptr.read(min(size, report_settings.uploadChunkSize))
+                if not chunk:
+                    self.parts.pop(0)
+                    continue
+            else:
+                chunk = self.parts.pop(0)
+
+            self.log_progress(len(chunk))
+            return chunk
+
+        return b""
+
+    #---------------------------------------#
+    def log_progress(self, chunkSize):
+        self.bytesSent += chunkSize
+        if self.bytesSent >= self.nextProgress or self.bytesSent == len(self):
+            logger.info("    Uploaded %s of %s bytes (%s%%)" %(self.bytesSent, len(self), 100 * self.bytesSent // len(self)))
+            self.nextProgress += report_settings.uploadProgressInterval
+
+    #---------------------------------------#
+    def close(self):
+        if self.file_ptr is not None:
+            self.file_ptr.close()
+            self.file_ptr = None
+
+#------------------------------------------------------------------#
+def upload_project_report_data(baseURL, projectID, reportID, authToken, uploadZipfile):
+    logger.info("Entering upload_project_report_data")
+
+    RESTAPI_URL = baseURL + "/codeinsight/api/projects/" + str(projectID) + "/reports/" + str(reportID) + "/data"
+    logger.debug("    RESTAPI_URL: %s" %RESTAPI_URL)
+
+    uploadStream = MultipartFileStream("file", uploadZipfile)
+    headers = {'Content-Type': uploadStream.contentType, 'Authorization': 'Bearer ' + authToken}
+
+    # The shared session applies the timeouts and rate limit but does not retry a POST
+    # so the complete archive is sent again here if the upload fails
+    session = report_session.sharedSession if report_session.sharedSession is not None else requests
+    maxAttempts = 1 + max(0, report_settings.maxUploadRetries)
+
+    logger.info("    Uploading %s (%s bytes)" %(uploadZipfile, uploadStream.fileSize))
+
+    try:
+        for attempt in range(1, maxAttempts + 1):
+            uploadStream.open()
+            response = None
+
+            try:
+                response = session.post(RESTAPI_URL, headers=headers, data=uploadStream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+                logger.warning("    Upload attempt %s of %s failed: %s" %(attempt, maxAttempts, error))
+            else:
+                if response.status_code in [200, 201, 204]:
+                    logger.info("    Report uploaded successfully")
+                    print("    Report uploaded successfully")
+                    return True
+
+                logger.warning("    Upload attempt %s of %s returned %s: %s" %(attempt, maxAttempts, response.status_code, response.text[:500]))
+
+                if response.status_code not in report_settings.retryStatusCodes:
+                    break
+
+            if attempt < maxAttempts:
+                time.sleep(report_session.get_retry_delay(attempt, response))
+    finally:
+        uploadStream.close()
+
+    logger.error("Unable to upload the report archive %s" %uploadZipfile)
+    print("    *** ERROR  ***  Unable to upload the report archive")
+    return False